@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Daily aggregate tables
+Maintains per-day rollups of trends, sentiment and article volume so the
+dashboard and the risk engine never GROUP BY over the raw tables.
+
+Each refresh recomputes only the days from `since` onward, so writers call
+it with the earliest date they touched.
+Run: python aggregates.py [--since YYYY-MM-DD]     # rebuild (default: everything)
+"""
+
+import argparse
+from datetime import date, datetime
+from sqlalchemy import text
+from db import get_engine
+import metrics
+import notify
+from sentiment_models import ACTIVE_MODEL
+
+# Per day/keyword, across geos. us_interest is the national series.
+TRENDS_SQL = [
+    "DELETE FROM agg_trends_daily WHERE date >= :since",
+    """
+    INSERT INTO agg_trends_daily (
+        date, keyword, geo_count, avg_interest, min_interest, max_interest, us_interest, refreshed_at
+    )
+    SELECT date,
+           keyword,
+           COUNT(*),
+           AVG(search_interest),
+           MIN(search_interest),
+           MAX(search_interest),
+           MAX(search_interest) FILTER (WHERE geo = 'US'),
+           :now
+    FROM raw_google_trends
+    WHERE date >= :since
+    GROUP BY date, keyword
+    """,
+]
+
+# Scores from the active model only (SENTIMENT_MODEL). Syndicated copies of
+# one story are averaged first, so every story counts once per day however
+# many outlets ran it; its label is the most common one among its copies.
+SENTIMENT_SQL = [
+    "DELETE FROM agg_sentiment_daily WHERE date >= :since",
+    """
+    INSERT INTO agg_sentiment_daily (
+        date, article_count, story_count, avg_sentiment, avg_subjectivity,
+        positive_count, negative_count, neutral_count, refreshed_at
+    )
+    SELECT day,
+           SUM(copies),
+           COUNT(*),
+           AVG(sentiment),
+           AVG(subjectivity),
+           COUNT(*) FILTER (WHERE label = 'positive'),
+           COUNT(*) FILTER (WHERE label = 'negative'),
+           COUNT(*) FILTER (WHERE label = 'neutral'),
+           :now
+    FROM (
+        SELECT DATE(n.published_at) AS day,
+               COALESCE(n.story_cluster_id, n.id) AS story,
+               COUNT(*) AS copies,
+               AVG(s.sentiment_score) AS sentiment,
+               AVG(s.subjectivity_score) AS subjectivity,
+               MODE() WITHIN GROUP (ORDER BY s.sentiment_label) AS label
+        FROM raw_news_articles n
+        JOIN news_sentiment s ON n.id = s.article_id AND s.model_name = :model
+        WHERE n.published_at >= :since
+        GROUP BY 1, 2
+    ) stories
+    GROUP BY day
+    """,
+    "DELETE FROM agg_sentiment_geo_daily WHERE date >= :since",
+    """
+    INSERT INTO agg_sentiment_geo_daily (date, geo, article_count, story_count, avg_sentiment, refreshed_at)
+    SELECT day,
+           geo,
+           SUM(copies),
+           COUNT(*),
+           AVG(sentiment),
+           :now
+    FROM (
+        SELECT DATE(n.published_at) AS day,
+               g.geo,
+               COALESCE(n.story_cluster_id, n.id) AS story,
+               COUNT(*) AS copies,
+               AVG(s.sentiment_score) AS sentiment
+        FROM raw_news_articles n
+        JOIN news_sentiment s ON n.id = s.article_id AND s.model_name = :model
+        CROSS JOIN LATERAL unnest(s.geos) AS g(geo)
+        WHERE n.published_at >= :since
+        GROUP BY 1, 2, 3
+    ) stories
+    GROUP BY day, geo
+    """,
+]
+
+ARTICLES_SQL = [
+    "DELETE FROM agg_articles_daily WHERE date >= :since",
+    """
+    INSERT INTO agg_articles_daily (date, source_name, query_category, article_count, story_count, refreshed_at)
+    SELECT DATE(published_at),
+           COALESCE(source_name, 'Unknown'),
+           COALESCE(query_category, ''),
+           COUNT(*),
+           COUNT(*) FILTER (WHERE story_cluster_id IS NULL OR story_cluster_id = id),
+           :now
+    FROM raw_news_articles
+    WHERE published_at >= :since
+    GROUP BY DATE(published_at), COALESCE(source_name, 'Unknown'), COALESCE(query_category, '')
+    """,
+]
+
+def _refresh(engine, statements, since, topic):
+    """Replace every aggregate row dated on/after `since` in one transaction"""
+    engine = engine or get_engine()
+    since = since or date(1900, 1, 1)
+    params = {'since': since, 'now': datetime.now(), 'model': ACTIVE_MODEL}
+    with engine.begin() as conn:
+        for sql in statements:
+            conn.execute(text(sql), params)
+        notify.publish(conn, topic)
+
+@metrics.timed('aggregates.trends')
+def refresh_trends(engine=None, since=None):
+    _refresh(engine, TRENDS_SQL, since, 'trends')
+
+@metrics.timed('aggregates.sentiment')
+def refresh_sentiment(engine=None, since=None):
+    _refresh(engine, SENTIMENT_SQL, since, 'sentiment')
+
+@metrics.timed('aggregates.articles')
+def refresh_articles(engine=None, since=None):
+    _refresh(engine, ARTICLES_SQL, since, 'news')
+
+def refresh_all(engine=None, since=None):
+    refresh_trends(engine, since)
+    refresh_articles(engine, since)
+    refresh_sentiment(engine, since)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild BioPulse daily aggregates")
+    parser.add_argument('--since', type=date.fromisoformat, help="first day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    
+    print("🔄 Refreshing daily aggregates...")
+    refresh_all(since=args.since)
+    print("✅ Aggregates refreshed")
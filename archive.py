@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Columnar Parquet archive
+Copies the raw tables, sentiment scores and risk scores into Parquet
+datasets partitioned by year and month (hive layout), e.g.
+    archive/raw_news_articles/year=2025/month=3/part-20250312T060000-0-0.parquet
+
+Each run only exports rows whose watermark column (scraped_at, analyzed_at,
+...) is at or after the previous run's high-water mark, so it is cheap to
+run after every pipeline run. Rows that were updated since are simply
+written again; read() keeps the newest copy of each key. Partitions that
+pile up many small files are compacted into one.
+
+read() loads column subsets and date ranges through pyarrow with memory
+mapping, so backfills and model experiments never touch PostgreSQL.
+Run: python archive.py [--table raw_news_articles ...] [--full] [--compact]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, time, timedelta
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+from sqlalchemy import text
+from db import get_engine, read_sql_chunks
+import content_blobs
+import metrics
+
+ARCHIVE_DIR = Path(os.getenv('ARCHIVE_DIR', Path(__file__).resolve().parent / 'archive'))
+EXPORT_CHUNK_ROWS = 50000
+COMPACT_AFTER_FILES = 24    # compact a partition once it holds this many files
+STATE_FILE = '_watermarks.json'
+
+# Per dataset: partition date column, key for de-duplication, watermark
+# column and columns left out (page HTML, the search tsvector).
+# news_sentiment is partitioned by its article's published_at; 'blobs' columns
+# moved to content_blobs (partition_maintenance.py) are exported in full.
+DATASETS = {
+    'raw_google_trends': {
+        'date': 'date',
+        'key': ['date', 'keyword', 'geo'],
+        'watermark': 'scraped_at',
+    },
+    'raw_cdc_cases': {
+        'date': 'report_date',
+        'key': ['report_date', 'state', 'county'],
+        'watermark': 'scrape_date',
+        'exclude': ['raw_html'],
+    },
+    'raw_news_articles': {
+        'date': 'published_at',
+        'key': ['article_url'],
+        'watermark': 'scraped_at',
+        'exclude': ['search_vector'],
+        'blobs': {'content': 'content_hash'},
+    },
+    'news_sentiment': {
+        'date': 'published_at',
+        'key': ['article_id', 'model_name'],
+        'watermark': 'analyzed_at',
+        'join': ("JOIN raw_news_articles n ON n.id = t.article_id", {'published_at': 'n.published_at'}),
+    },
+    'risk_assessment': {
+        'date': 'assessment_date',
+        'key': ['assessment_date', 'geo'],
+        'watermark': 'calculated_at',
+    },
+}
+
+PARTITIONING = ds.partitioning(pa.schema([('year', pa.int16()), ('month', pa.int8())]), flavor='hive')
+
+# PostgreSQL information_schema data_type -> Arrow type
+PG_TYPES = {
+    'smallint': pa.int16(),
+    'integer': pa.int32(),
+    'bigint': pa.int64(),
+    'real': pa.float32(),
+    'double precision': pa.float64(),
+    'numeric': pa.float64(),
+    'boolean': pa.bool_(),
+    'date': pa.date32(),
+    'timestamp without time zone': pa.timestamp('us'),
+    'timestamp with time zone': pa.timestamp('us', tz='UTC'),
+    'ARRAY': pa.list_(pa.string()),
+}
+
+COLUMNS_SQL = text("""
+SELECT table_name, column_name, data_type
+FROM information_schema.columns
+WHERE table_schema = 'public' AND table_name = ANY(:tables)
+ORDER BY table_name, ordinal_position
+""")
+
+def _state_path(root):
+    return Path(root) / STATE_FILE
+
+def load_watermarks(root=ARCHIVE_DIR):
+    path = _state_path(root)
+    if not path.exists():
+        return {}
+    return {table: datetime.fromisoformat(value) for table, value in json.loads(path.read_text()).items()}
+
+def save_watermarks(watermarks, root=ARCHIVE_DIR):
+    path = _state_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps({t: w.isoformat() for t, w in watermarks.items()}, indent=2))
+    tmp.replace(path)
+
+def _schemas(engine, tables):
+    """{table: (select list, arrow schema)} from the live table definitions"""
+    with engine.connect() as conn:
+        rows = conn.execute(COLUMNS_SQL, {'tables': list(tables)}).fetchall()
+    
+    columns = {}
+    for table, column, data_type in rows:
+        columns.setdefault(table, []).append((column, PG_TYPES.get(data_type, pa.string())))
+    
+    result = {}
+    for table in tables:
+        spec = DATASETS[table]
+        fields = [(c, t) for c, t in columns.get(table, []) if c not in spec.get('exclude', [])]
+        select = [f"t.{c}" for c, _ in fields]
+        if 'join' in spec:
+            for name, expr in spec['join'][1].items():
+                select.append(f"{expr} AS {name}")
+                fields.append((name, pa.timestamp('us')))
+        result[table] = (select, pa.schema(fields))
+    return result
+
+def _with_partitions(table, date_column):
+    """Add year/month columns from the date column (0/0 for undated rows)"""
+    dates = table.column(date_column)
+    year = pc.fill_null(pc.cast(pc.year(dates), pa.int16()), 0)
+    month = pc.fill_null(pc.cast(pc.month(dates), pa.int8()), 0)
+    return table.append_column('year', year).append_column('month', month)
+
+def _partition_dirs(table_root, years_months):
+    return [Path(table_root) / f"year={y}" / f"month={m}" for y, m in years_months]
+
+def compact_partition(path):
+    """Rewrite one partition directory as a single de-duplicated file"""
+    files = sorted(Path(path).glob('*.parquet'))
+    if len(files) < 2:
+        return 0
+    table_name = Path(path).parent.parent.name
+    spec = DATASETS[table_name]
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files])
+    df = ds.dataset([str(f) for f in files], schema=schema, format='parquet').to_table().to_pandas()
+    df = _dedupe(df, spec)
+    target = Path(path) / f"part-compacted-{datetime.now():%Y%m%dT%H%M%S%f}.parquet"
+    pq.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False), target)
+    # The new file is complete before the old ones disappear
+    for f in files:
+        f.unlink()
+    return len(files)
+
+def compact(table, root=ARCHIVE_DIR, min_files=2):
+    """Compact every partition of one dataset holding at least min_files files"""
+    compacted = 0
+    for path in sorted((Path(root) / table).glob('year=*/month=*')):
+        if len(list(path.glob('*.parquet'))) >= min_files:
+            compact_partition(path)
+            compacted += 1
+    return compacted
+
+@metrics.timed('archive.export')
+def export_table(engine, table, since=None, root=ARCHIVE_DIR, schema_info=None):
+    """
+    Append rows changed at or after `since` (everything if None) to the
+    table's dataset. Returns (rows written, new watermark or None).
+    """
+    spec = DATASETS[table]
+    select, schema = schema_info or _schemas(engine, [table])[table]
+    query = f"SELECT {', '.join(select)} FROM {table} t {spec['join'][0] if 'join' in spec else ''}"
+    params = {}
+    if since is not None:
+        query += f" WHERE t.{spec['watermark']} >= :since"
+        params['since'] = since
+    
+    table_root = Path(root) / table
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    rows, watermark, touched = 0, None, set()
+    for n, df in enumerate(read_sql_chunks(text(query), engine, params=params, chunksize=EXPORT_CHUNK_ROWS)):
+        if df.empty:
+            continue
+        for column, hash_column in spec.get('blobs', {}).items():
+            offloaded = df[column].isna() & df[hash_column].notna()
+            if offloaded.any():
+                with engine.connect() as conn:
+                    texts = content_blobs.load(conn, df.loc[offloaded, hash_column])
+                df.loc[offloaded, column] = df.loc[offloaded, hash_column].map(texts)
+        arrow = _with_partitions(pa.Table.from_pandas(df, schema=schema, preserve_index=False), spec['date'])
+        pq.write_to_dataset(arrow, root_path=str(table_root), partition_cols=['year', 'month'],
+                            basename_template=f"part-{stamp}-{n}-{{i}}.parquet",
+                            existing_data_behavior='overwrite_or_ignore')
+        touched.update(zip(arrow.column('year').to_pylist(), arrow.column('month').to_pylist()))
+        rows += len(df)
+        chunk_max = pd.to_datetime(df[spec['watermark']]).max()
+        if pd.notna(chunk_max) and (watermark is None or chunk_max > watermark):
+            watermark = chunk_max.to_pydatetime()
+    metrics.add_rows(fetched=rows, written=rows)
+    
+    for path in _partition_dirs(table_root, touched):
+        if len(list(path.glob('*.parquet'))) >= COMPACT_AFTER_FILES:
+            compact_partition(path)
+    return rows, watermark
+
+@metrics.timed('archive')
+def main(engine=None, tables=None, full=False, root=ARCHIVE_DIR):
+    """Export every dataset incrementally; returns {table: rows written}"""
+    print("🗄️ Archiving to Parquet...")
+    engine = engine or get_engine()
+    tables = tables or list(DATASETS)
+    watermarks = {} if full else load_watermarks(root)
+    schemas = _schemas(engine, tables)
+    
+    written = {}
+    for table in tables:
+        since = watermarks.get(table)
+        rows, watermark = export_table(engine, table, since, root, schemas[table])
+        written[table] = rows
+        if watermark is not None:
+            watermarks[table] = watermark
+            save_watermarks(watermarks, root)
+        print(f"   {table}: {rows:,} rows" + (f" (since {since:%Y-%m-%d %H:%M})" if since else ""))
+    
+    print(f"✅ Archive updated in {root}")
+    return written
+
+def _dedupe(df, spec):
+    """Newest row per key (rows updated after an export appear more than once)"""
+    if df.empty:
+        return df
+    df = df.sort_values(spec['watermark'], kind='stable')
+    return df.drop_duplicates(subset=spec['key'], keep='last').sort_index()
+
+def _month_filter(start, end):
+    """Partition-pruning expression for the months spanned by start..end"""
+    expr = None
+    if start is not None:
+        expr = (ds.field('year') > start.year) | ((ds.field('year') == start.year) & (ds.field('month') >= start.month))
+    if end is not None:
+        upper = (ds.field('year') < end.year) | ((ds.field('year') == end.year) & (ds.field('month') <= end.month))
+        expr = upper if expr is None else expr & upper
+    return expr
+
+def dataset(table, root=ARCHIVE_DIR):
+    """pyarrow Dataset over one archived table (memory-mapped local files)"""
+    files = sorted((Path(root) / table).glob('year=*/month=*/*.parquet'))
+    if not files:
+        return None
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [PARTITIONING.schema])
+    return ds.dataset([str(f) for f in files], schema=schema, format='parquet',
+                      partitioning=PARTITIONING, partition_base_dir=str(Path(root) / table),
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+@metrics.timed('archive.read')
+def read(table, columns=None, start=None, end=None, filters=None, dedupe=True, root=ARCHIVE_DIR):
+    """
+    Load an archived table as a DataFrame.
+    - columns: subset to read (others are never decoded)
+    - start/end: inclusive date range on the dataset's date column; whole
+      months outside it are skipped without opening their files
+    - filters: extra pyarrow expression or [(column, op, value), ...] list
+    - dedupe: keep only the newest copy of each key
+    """
+    spec = DATASETS[table]
+    data = dataset(table, root)
+    if data is None:
+        return pd.DataFrame(columns=columns or [])
+    
+    date_col = spec['date']
+    expr = _month_filter(start, end)
+    date_type = data.schema.field(date_col).type
+    if start is not None:
+        bound = datetime.combine(start, time.min) if pa.types.is_timestamp(date_type) else start
+        expr = expr & (ds.field(date_col) >= pa.scalar(bound, type=date_type))
+    if end is not None:
+        if pa.types.is_timestamp(date_type):
+            expr = expr & (ds.field(date_col) < pa.scalar(datetime.combine(end + timedelta(days=1), time.min), type=date_type))
+        else:
+            expr = expr & (ds.field(date_col) <= pa.scalar(end, type=date_type))
+    if filters is not None:
+        extra = pq.filters_to_expression(filters) if isinstance(filters, list) else filters
+        expr = extra if expr is None else expr & extra
+    
+    read_columns = None
+    if columns is not None:
+        needed = list(columns) + (spec['key'] + [spec['watermark']] if dedupe else [])
+        read_columns = list(dict.fromkeys(needed))
+    
+    df = data.to_table(columns=read_columns, filter=expr).to_pandas()
+    metrics.add_rows(fetched=len(df))
+    if dedupe:
+        df = _dedupe(df, spec).reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
+    else:
+        df = df.drop(columns=['year', 'month'])
+    return df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export BioPulse tables to the Parquet archive")
+    parser.add_argument('--table', action='append', choices=list(DATASETS), help="only this table (repeatable)")
+    parser.add_argument('--full', action='store_true', help="ignore watermarks and export everything again")
+    parser.add_argument('--compact', action='store_true', help="compact every partition instead of exporting")
+    args = parser.parse_args()
+    
+    if args.compact:
+        for table in args.table or DATASETS:
+            print(f"🗜️ {table}: {compact(table)} partitions compacted")
+    else:
+        main(tables=args.table, full=args.full)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+BioPulse pipeline benchmarks
+Loads deterministic synthetic data into a scratch PostgreSQL database and
+times each stage separately: ingestion writes, sentiment scoring, aggregate
+refresh, risk scoring and every dashboard loader query.
+
+The target database is wiped and re-created from init_db.sql, so it must
+never be the production database. No network access is needed.
+
+Run: python benchmarks/run_benchmarks.py --database-url postgresql://.../biopulse_bench
+     python benchmarks/run_benchmarks.py --embedded    # needs `pip install pgserver`
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic_data import generate_trends, generate_cdc, generate_articles  # noqa: E402
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def start_embedded_server():
+    """Start a throwaway PostgreSQL from the pgserver wheel; returns its URL"""
+    try:
+        import pgserver
+    except ImportError:
+        sys.exit("❌ --embedded needs the optional pgserver package: pip install pgserver")
+    server = pgserver.get_server(tempfile.mkdtemp(prefix='biopulse_bench_'), cleanup_mode='stop')
+    server.psql("CREATE DATABASE biopulse_bench;")
+    return server, server.get_uri('biopulse_bench')
+
+class Timer:
+    """Collects one record per timed stage"""
+    
+    def __init__(self):
+        self.stages = []
+    
+    def run(self, name, func, rows=None):
+        print(f"⏱️  {name}...", end=' ', flush=True)
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        if callable(rows):
+            rows = rows(result)
+        self.stages.append({'stage': name, 'seconds': round(seconds, 4), 'rows': rows})
+        print(f"{seconds:.3f}s" + (f" ({rows:,} rows)" if rows is not None else ""))
+        return result
+
+def reset_schema(engine):
+    sql = (ROOT / 'init_db.sql').read_text()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(sql)
+
+def run(args):
+    # Modules read DATABASE_URL when the shared engine is first created
+    os.environ['DATABASE_URL'] = args.database_url
+    from db import get_engine
+    from ingest import upsert_dataframe
+    import aggregates
+    import sentiment_analysis
+    import story_clusters
+    import calculate_risk_score
+    import archive
+    import partition_maintenance
+    
+    engine = get_engine()
+    reset_schema(engine)
+    timer = Timer()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=args.days - 1)
+    
+    trends = generate_trends(args.days, end_date, seed=args.seed)
+    cdc = generate_cdc(args.days, end_date, seed=args.seed)
+    articles = generate_articles(args.articles, args.days, end_date, seed=args.seed)
+    # Monthly partitions for the whole synthetic history (init_db.sql only creates the last year)
+    partition_maintenance.ensure_partitions(engine, start=start_date)
+    
+    # 1. Ingestion writes
+    timer.run('ingest.raw_google_trends', lambda: upsert_dataframe(engine, trends, 'raw_google_trends'), len(trends))
+    timer.run('ingest.raw_cdc_cases', lambda: upsert_dataframe(engine, cdc, 'raw_cdc_cases'), len(cdc))
+    timer.run('ingest.raw_news_articles', lambda: upsert_dataframe(engine, articles, 'raw_news_articles'), len(articles))
+    timer.run('ingest.raw_news_articles.rerun', lambda: upsert_dataframe(engine, articles, 'raw_news_articles'), len(articles))
+    timer.run('clusters.assign', lambda: story_clusters.assign_clusters(engine), len(articles))
+    timer.run('aggregates.trends_and_articles', lambda: (aggregates.refresh_trends(engine), aggregates.refresh_articles(engine)))
+    
+    # 2. Sentiment scoring (cold cache, a no-op incremental run, then the lexicon model on the same articles)
+    timer.run('sentiment.full', lambda: sentiment_analysis.main(workers=args.workers, engine=engine), len(articles))
+    timer.run('sentiment.incremental_noop', lambda: sentiment_analysis.main(workers=args.workers, engine=engine))
+    timer.run('sentiment.full.lexicon', lambda: sentiment_analysis.main(engine=engine, model='lexicon'), len(articles))
+    
+    # 3. Risk scoring
+    timer.run('risk.today', lambda: calculate_risk_score.calculate_risk_score(engine=engine), 1)
+    timer.run('risk.backfill', lambda: calculate_risk_score.score_range(engine, start_date, end_date), args.days)
+    
+    # 4. Article content older than 30 days moved to content_blobs, then the Parquet
+    #    archive (full export, a no-op incremental run, a 30-day column read)
+    timer.run('partitions.offload', lambda: partition_maintenance.offload_content(engine, 'raw_news_articles', 30),
+              lambda n: n)
+    archive_dir = tempfile.mkdtemp(prefix='biopulse_archive_')
+    timer.run('archive.export_full', lambda: archive.main(engine=engine, root=archive_dir), len(articles))
+    timer.run('archive.export_incremental', lambda: archive.main(engine=engine, root=archive_dir))
+    timer.run('archive.read_news_30d', lambda: archive.read('raw_news_articles', columns=['published_at', 'title'],
+                                                           start=end_date - timedelta(days=30), end=end_date,
+                                                           root=archive_dir), len)
+    
+    # 5. Dashboard loader queries (uncached underlying functions)
+    import streamlit  # noqa: F401  (imported so the dashboard module loads in bare mode)
+    sys.path.insert(0, str(ROOT / 'dashboard'))
+    import app as dashboard
+    loaders = [
+        ('load_filter_options', (engine,)),
+        ('load_google_trends', (engine, start_date, end_date)),
+        ('load_cdc_summary', (engine, start_date, end_date)),
+        ('load_cdc_cases', (engine, start_date, end_date)),
+        ('load_news_count', (engine, start_date, end_date)),
+        ('load_news_articles', (engine, start_date, end_date)),
+        ('load_article_volume', (engine, start_date, end_date)),
+        ('load_sentiment_daily', (engine, start_date, end_date)),
+        ('load_sentiment', (engine, start_date, end_date)),
+        ('load_risk_score', (engine,)),
+        ('load_search_count', (engine, 'deadly outbreak', start_date, end_date)),
+        ('load_search_results', (engine, 'deadly outbreak', start_date, end_date)),
+        ('get_data_stats', (engine,)),
+    ]
+    for name, loader_args in loaders:
+        func = getattr(dashboard, name).__wrapped__
+        timer.run(f'dashboard.{name}', lambda: func(*loader_args),
+                  lambda r: len(r) if hasattr(r, '__len__') and not isinstance(r, (dict, int)) else None)
+    
+    return timer.stages
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the BioPulse pipeline on synthetic data")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--database-url', help="scratch database (it is wiped!)")
+    target.add_argument('--embedded', action='store_true', help="start a throwaway PostgreSQL via pgserver")
+    parser.add_argument('--days', type=int, default=365, help="days of Trends/CDC history")
+    parser.add_argument('--articles', type=int, default=20000, help="number of news articles")
+    parser.add_argument('--workers', type=int, default=None, help="sentiment worker processes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=None, help="JSON report path")
+    args = parser.parse_args()
+    
+    server = None
+    if args.embedded:
+        server, args.database_url = start_embedded_server()
+    
+    print("🏁 BioPulse benchmarks")
+    print(f"   {args.days} days, {args.articles:,} articles, seed {args.seed}")
+    started = datetime.now()
+    try:
+        stages = run(args)
+    finally:
+        if server is not None:
+            server.cleanup()
+    
+    report = {
+        'started_at': started.isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'days': args.days,
+            'articles': args.articles,
+            'workers': args.workers,
+            'seed': args.seed,
+            'embedded': args.embedded,
+        },
+        'stages': stages,
+        'total_seconds': round(sum(s['seconds'] for s in stages), 4),
+    }
+    
+    output = args.output or ROOT / 'benchmarks' / 'results' / f"bench_{started:%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n✅ Report written to {output}")
+
+if __name__ == '__main__':
+    main()
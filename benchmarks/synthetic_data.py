@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data for benchmarks
+Produces DataFrames shaped like the scraper output for each raw_* table.
+The same seed always yields the same rows.
+"""
+
+from datetime import datetime, date, timedelta
+
+import numpy as np
+import pandas as pd
+
+KEYWORDS = ['measles', 'mmr vaccine', 'measles outbreak']
+QUERIES = ['measles outbreak', 'measles vaccine', 'MMR vaccine', 'anti-vax measles']
+SOURCES = [f"Source {i}" for i in range(40)]
+
+# Mix of neutral filler and words TextBlob scores, so sentiment is non-trivial
+VOCABULARY = (
+    "health officials reported new measles cases county state school children vaccine "
+    "clinic hospital outbreak exposure public department confirmed travel community "
+    "dose immunization rate parents doctors week month year update according data "
+    "good great safe effective successful strong positive protect recovered "
+    "bad terrible dangerous serious severe worst deadly alarming worried concerning"
+).split()
+
+def _sentences(rng, n, min_words, max_words):
+    """n random sentences with word counts in [min_words, max_words]"""
+    lengths = rng.integers(min_words, max_words + 1, size=n)
+    words = rng.choice(VOCABULARY, size=int(lengths.sum()))
+    out, pos = [], 0
+    for length in lengths:
+        out.append(' '.join(words[pos:pos + length]).capitalize() + '.')
+        pos += length
+    return out
+
+def generate_trends(days, end_date=None, geos=('US',), seed=0):
+    """One row per day, keyword and geo"""
+    rng = np.random.default_rng(seed)
+    end_date = end_date or date.today()
+    dates = pd.date_range(end=end_date, periods=days)
+    rows = len(dates) * len(KEYWORDS) * len(geos)
+    grid = pd.MultiIndex.from_product([dates, KEYWORDS, geos], names=['date', 'keyword', 'geo']).to_frame(index=False)
+    grid['search_interest'] = rng.integers(0, 101, size=rows)
+    grid['keyword_group'] = 1
+    grid['scraped_at'] = datetime.now()
+    return grid[['date', 'keyword', 'search_interest', 'keyword_group', 'geo', 'scraped_at']]
+
+def generate_cdc(days, end_date=None, seed=0):
+    """Weekly national reports with a slowly growing case count"""
+    rng = np.random.default_rng(seed + 1)
+    end_date = end_date or date.today()
+    dates = pd.date_range(end=end_date, periods=days)[::-7][::-1]
+    cases = np.cumsum(rng.integers(0, 40, size=len(dates))) + 50
+    return pd.DataFrame({
+        'report_date': dates.date,
+        'state': 'US',
+        'county': None,
+        'case_count': cases,
+        'source_url': 'https://www.cdc.gov/measles/data-research/index.html',
+        'raw_html': None
+    })
+
+def generate_articles(n, days, end_date=None, seed=0, duplicate_rate=0.2):
+    """
+    n articles spread over the last `days` days.
+    Title ~8-16 words, description ~20-45 words, content ~200 characters
+    (NewsAPI truncates content). A duplicate_rate share reuse an earlier
+    title/description under a new URL, like syndicated wire stories.
+    """
+    rng = np.random.default_rng(seed + 2)
+    end = datetime.combine(end_date or date.today(), datetime.min.time()) + timedelta(days=1)
+    offsets = rng.integers(0, days * 86400, size=n)
+    published = [end - timedelta(seconds=int(s)) for s in offsets]
+    
+    titles = _sentences(rng, n, 8, 16)
+    descriptions = _sentences(rng, n, 20, 45)
+    contents = [c[:200] for c in _sentences(rng, n, 30, 50)]
+    
+    originals = max(1, int(n * (1 - duplicate_rate)))
+    for i in range(originals, n):
+        j = int(rng.integers(0, originals))
+        titles[i], descriptions[i] = titles[j], descriptions[j]
+    
+    return pd.DataFrame({
+        'article_url': [f"https://news.example.com/{seed}/{i}" for i in range(n)],
+        'query_category': rng.choice(QUERIES, size=n),
+        'source_name': rng.choice(SOURCES, size=n),
+        'author': None,
+        'title': titles,
+        'description': descriptions,
+        'content': contents,
+        'published_at': published,
+        'scraped_at': datetime.now()
+    })
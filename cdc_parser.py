@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+CDC measles page parser
+Turns the per-jurisdiction case tables on the CDC measles page into
+raw_cdc_cases rows: one national row (state 'US') plus one row per state.
+Only the <main> section is handed to lxml, and only its tables are walked.
+Run: python cdc_parser.py fixtures/cdc_measles_sample.html
+Tests: python -m pytest tests/test_cdc_parser.py
+"""
+
+import re
+import sys
+import lxml.html
+import pandas as pd
+from datetime import datetime
+from geo import US_STATES, NATIONAL
+
+SECTION_PATTERN = re.compile(r'<main\b.*?</main>', re.IGNORECASE | re.DOTALL)
+# "650 cases", "1,267 confirmed measles cases", "97 measles cases", "1,282 individual cases"
+CASES_PATTERN = re.compile(r'(\d[\d,]*)\s+(?:(?:confirmed|individual|measles)\s+){0,2}cases?', re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r'\d[\d,]*')
+
+# Header words that identify the jurisdiction and case-count columns
+JURISDICTION_HEADERS = ('jurisdiction', 'state', 'location')
+CASE_HEADERS = ('case',)
+TOTAL_LABELS = ('total', 'u.s.', 'united states', 'us')
+
+STATE_CODES = {name.lower(): code for name, code in US_STATES.items()}
+STATE_CODES.update({code.lower(): code for code in US_STATES.values()})
+
+def relevant_section(html):
+    """The <main> element (where the case counts live), or the whole page"""
+    match = SECTION_PATTERN.search(html)
+    return match.group(0) if match else html
+
+def _number(value):
+    match = NUMBER_PATTERN.search(value or '')
+    return int(match.group(0).replace(',', '')) if match else None
+
+def _cell_text(cell):
+    return ' '.join(cell.text_content().split())
+
+def _column(headers, words):
+    for i, header in enumerate(headers):
+        if any(word in header for word in words):
+            return i
+    return None
+
+def parse_tables(root):
+    """
+    (jurisdiction, cases) pairs from every table that has both a
+    jurisdiction column and a case-count column.
+    """
+    pairs = []
+    for table in root.iter('table'):
+        rows = table.xpath('.//tr')
+        if not rows:
+            continue
+        headers = [_cell_text(c).lower() for c in rows[0].xpath('./th|./td')]
+        name_col = _column(headers, JURISDICTION_HEADERS)
+        case_col = _column(headers, CASE_HEADERS)
+        if name_col is None or case_col is None:
+            continue
+        for row in rows[1:]:
+            cells = row.xpath('./th|./td')
+            if len(cells) <= max(name_col, case_col):
+                continue
+            cases = _number(_cell_text(cells[case_col]))
+            if cases is not None:
+                pairs.append((_cell_text(cells[name_col]), cases))
+    return pairs
+
+def parse_cdc_page(html, url, report_date=None):
+    """
+    raw_cdc_cases rows for one CDC page (empty DataFrame if nothing found).
+    The national count is the table's total row, else the sum of the
+    state rows, else the first "N cases" phrase in the section text.
+    Jurisdictions that are not states (e.g. New York City) keep their name.
+    """
+    root = lxml.html.fromstring(relevant_section(html))
+    report_date = report_date or datetime.now().date()
+    
+    national = None
+    states = {}
+    for name, cases in parse_tables(root):
+        key = name.lower().rstrip('*').strip()
+        if key in TOTAL_LABELS or key.startswith('total'):
+            national = cases
+        else:
+            states[STATE_CODES.get(key, name[:50])] = cases
+    
+    if national is None and states:
+        national = sum(states.values())
+    if national is None:
+        match = CASES_PATTERN.search(root.text_content())
+        national = int(match.group(1).replace(',', '')) if match else None
+    if national is None:
+        return pd.DataFrame()
+    
+    rows = [{'report_date': report_date, 'state': NATIONAL, 'county': None, 'case_count': national}]
+    rows += [{'report_date': report_date, 'state': state, 'county': None, 'case_count': cases}
+             for state, cases in sorted(states.items())]
+    df = pd.DataFrame(rows)
+    df['source_url'] = url
+    return df
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python cdc_parser.py PAGE.html")
+        sys.exit(1)
+    with open(sys.argv[1], encoding='utf-8') as f:
+        df = parse_cdc_page(f.read(), sys.argv[1])
+    if df.empty:
+        print("⚠️ No case counts found")
+    else:
+        print(f"📊 {len(df) - 1} jurisdictions, {df['case_count'].iloc[0]} cases nationally")
+        print(df[['state', 'case_count']].to_string(index=False))
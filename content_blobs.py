@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Content-addressed blob store
+Bulky text that is rarely read again (old article content, stored CDC pages)
+is kept once per distinct value in `content_blobs`, keyed by the SHA-256 of
+the text and zlib-compressed. The row that held it keeps only the hash.
+Identical values (every row of one CDC scrape, syndicated article bodies)
+share a single blob.
+"""
+
+import hashlib
+import zlib
+
+from sqlalchemy import text
+
+COMPRESSION_LEVEL = 6
+
+INSERT_SQL = text("""
+INSERT INTO content_blobs (sha256, data, size)
+SELECT * FROM unnest(CAST(:hashes AS char(64)[]), CAST(:blobs AS bytea[]), CAST(:sizes AS integer[]))
+ON CONFLICT (sha256) DO NOTHING
+""")
+
+SELECT_SQL = text("SELECT sha256, data FROM content_blobs WHERE sha256 = ANY(:hashes)")
+
+def digest(value):
+    """SHA-256 hex digest of a text value"""
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+def store(conn, values):
+    """
+    Save texts on an open connection; returns their hashes in order.
+    Values already stored are not written again.
+    """
+    hashes = [digest(v) for v in values]
+    unique = dict(zip(hashes, values))
+    if unique:
+        encoded = {h: v.encode('utf-8') for h, v in unique.items()}
+        conn.execute(INSERT_SQL, {
+            'hashes': list(encoded),
+            'blobs': [zlib.compress(b, COMPRESSION_LEVEL) for b in encoded.values()],
+            'sizes': [len(b) for b in encoded.values()],
+        })
+    return hashes
+
+def load(conn, hashes):
+    """{hash: text} for the given hashes (missing ones are left out)"""
+    hashes = sorted({h for h in hashes if h})
+    if not hashes:
+        return {}
+    return {sha.strip(): zlib.decompress(bytes(data)).decode('utf-8')
+            for sha, data in conn.execute(SELECT_SQL, {'hashes': hashes})}
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Database connection factory
+Every module gets its SQLAlchemy engine from here, so one process shares one
+connection pool, tuned through environment variables (see .env.template).
+"""
+
+import os
+import threading
+import pandas as pd
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+import metrics
+
+load_dotenv()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+def database_url():
+    """DATABASE_URL if set, otherwise built from the POSTGRES_* variables"""
+    url = os.getenv('DATABASE_URL')
+    if url:
+        return url
+    return "postgresql://{user}:{password}@{host}:{port}/{db}".format(
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+        host=os.getenv('POSTGRES_HOST', '127.0.0.1'),
+        port=os.getenv('POSTGRES_PORT', '5432'),
+        db=os.getenv('POSTGRES_DB', 'biopulse')
+    )
+
+def engine_options():
+    """Pool and connection settings from the environment"""
+    options = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),
+    }
+    
+    # Server-side settings applied to every new connection
+    server_options = []
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+    if statement_timeout > 0:
+        server_options.append(f"-c statement_timeout={statement_timeout}")
+    
+    connect_args = {'application_name': os.getenv('DB_APPLICATION_NAME', 'biopulse')}
+    if server_options:
+        connect_args['options'] = ' '.join(server_options)
+    options['connect_args'] = connect_args
+    return options
+
+def create_db_engine(**overrides):
+    """Build a new engine (most callers want get_engine() instead)"""
+    options = engine_options()
+    options.update(overrides)
+    return metrics.instrument_engine(create_engine(database_url(), **options))
+
+def get_engine():
+    """The process-wide pooled engine, created on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine()
+    return _engine
+
+def dispose_engine():
+    """Close every pooled connection (call once, at process exit)"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+def read_sql_chunks(query, engine=None, params=None, chunksize=10000):
+    """
+    Yield DataFrames of at most chunksize rows using a server-side cursor, so
+    the full result set is never held in memory.
+    """
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True)
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+            yield chunk
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+US geography lookups shared by the scrapers and the dashboard
+Google Trends and the dashboard map use ISO 3166-2 style codes: 'US' for
+the whole country and 'US-XX' for a state.
+"""
+
+import re
+
+US_STATES = {
+    'Alabama': 'AL', 'Alaska': 'AK', 'Arizona': 'AZ', 'Arkansas': 'AR',
+    'California': 'CA', 'Colorado': 'CO', 'Connecticut': 'CT', 'Delaware': 'DE',
+    'District of Columbia': 'DC', 'Florida': 'FL', 'Georgia': 'GA', 'Hawaii': 'HI',
+    'Idaho': 'ID', 'Illinois': 'IL', 'Indiana': 'IN', 'Iowa': 'IA',
+    'Kansas': 'KS', 'Kentucky': 'KY', 'Louisiana': 'LA', 'Maine': 'ME',
+    'Maryland': 'MD', 'Massachusetts': 'MA', 'Michigan': 'MI', 'Minnesota': 'MN',
+    'Mississippi': 'MS', 'Missouri': 'MO', 'Montana': 'MT', 'Nebraska': 'NE',
+    'Nevada': 'NV', 'New Hampshire': 'NH', 'New Jersey': 'NJ', 'New Mexico': 'NM',
+    'New York': 'NY', 'North Carolina': 'NC', 'North Dakota': 'ND', 'Ohio': 'OH',
+    'Oklahoma': 'OK', 'Oregon': 'OR', 'Pennsylvania': 'PA', 'Rhode Island': 'RI',
+    'South Carolina': 'SC', 'South Dakota': 'SD', 'Tennessee': 'TN', 'Texas': 'TX',
+    'Utah': 'UT', 'Vermont': 'VT', 'Virginia': 'VA', 'Washington': 'WA',
+    'West Virginia': 'WV', 'Wisconsin': 'WI', 'Wyoming': 'WY',
+}
+
+NATIONAL = 'US'
+
+def state_geo(code):
+    """'CA' -> 'US-CA'"""
+    return f"{NATIONAL}-{code}"
+
+def all_geos():
+    """The national geo followed by every state geo"""
+    return [NATIONAL] + [state_geo(code) for code in US_STATES.values()]
+
+def parse_geos(value):
+    """
+    Parse a comma-separated geo list such as 'US,US-CA,US-NY'.
+    'all' (or an empty value) means the nation plus every state.
+    """
+    if not value or value.strip().lower() == 'all':
+        return all_geos()
+    return [g.strip().upper() for g in value.split(',') if g.strip()]
+
+# Longest names first so 'West Virginia' wins over 'Virginia'
+_STATE_NAME_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(name) for name in sorted(US_STATES, key=len, reverse=True)) + r')\b'
+)
+
+def states_mentioned(text):
+    """Sorted state geos ('US-XX') whose names appear in text"""
+    if not text:
+        return []
+    return sorted({state_geo(US_STATES[name]) for name in _STATE_NAME_PATTERN.findall(text)})
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Idempotent bulk ingestion for the raw_* tables
+Rows are streamed into a temporary staging table with PostgreSQL COPY and
+merged with INSERT ... ON CONFLICT, so re-running a scrape is cheap and safe.
+A merge that changed rows publishes its table's topic (see notify.py).
+"""
+
+import io
+from collections import namedtuple
+
+import pandas as pd
+import notify
+
+UpsertResult = namedtuple('UpsertResult', ['inserted', 'updated', 'skipped'])
+
+# Conflict key and merge behaviour per raw table.
+# update: columns overwritten when any of them changed (None = DO NOTHING)
+# touch:  columns refreshed alongside an update but ignored when comparing
+# topic:  change event published when rows were inserted or updated
+# reset:  columns set to NULL by an update (derived data to recompute)
+# match_nulls: key columns under UNIQUE NULLS NOT DISTINCT (NULL matches NULL)
+TABLES = {
+    'raw_google_trends': {
+        'conflict': ['date', 'keyword', 'geo'],
+        'update': ['search_interest', 'keyword_group', 'is_partial'],
+        'touch': ['scraped_at'],
+        'topic': 'trends',
+    },
+    'raw_cdc_cases': {
+        'conflict': ['report_date', 'state', 'county'],
+        'match_nulls': ['state', 'county'],
+        'update': ['case_count', 'source_url', 'raw_html'],
+        'touch': ['scrape_date'],
+        'topic': 'cdc',
+    },
+    'raw_news_articles': {
+        # Unique keys on a partitioned table must include its partition key
+        'conflict': ['article_url', 'published_at'],
+        'update': ['title', 'description', 'content'],
+        'touch': ['scraped_at'],
+        # Changed text is clustered again (story_clusters.assign_clusters)
+        'reset': ['story_cluster_id'],
+        'topic': 'news',
+    },
+}
+
+NULL_MARKER = r'\N'
+
+def _prepare(df):
+    """Make float columns that only hold whole numbers integer-typed for COPY"""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(df[col]):
+            values = df[col].dropna()
+            if len(values) and (values == values.round()).all():
+                df[col] = df[col].astype('Int64')
+    return df
+
+def _merge_sql(table, staging, columns, conflict, update, touch, reset=()):
+    cols = ', '.join(columns)
+    sql = f"""
+    INSERT INTO {table} ({cols})
+    SELECT {cols} FROM {staging}
+    ON CONFLICT ({', '.join(conflict)})
+    """
+    if not update:
+        sql += "DO NOTHING"
+    else:
+        assignments = ', '.join([f"{c} = EXCLUDED.{c}" for c in list(update) + list(touch) if c in columns]
+                                + [f"{c} = NULL" for c in reset])
+        changed = [c for c in update if c in columns]
+        sql += f"""DO UPDATE SET {assignments}
+    WHERE ({', '.join(f'{table}.{c}' for c in changed)}) IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in changed)})"""
+    return sql
+
+def _existing_sql(table, staging, conflict, match_nulls):
+    """Staged keys already present (xmax can't be read through a partitioned table)"""
+    match = ' AND '.join(f"t.{c} IS NOT DISTINCT FROM s.{c}" if c in match_nulls else f"t.{c} = s.{c}"
+                         for c in conflict)
+    return f"SELECT COUNT(*) FROM {staging} s WHERE EXISTS (SELECT 1 FROM {table} t WHERE {match})"
+
+def upsert_dataframe(engine, df, table, conflict=None, update=None, touch=None):
+    """
+    Upsert df into table in one transaction.
+    Returns UpsertResult(inserted, updated, skipped); skipped covers rows that
+    already existed unchanged and duplicate keys within df (last one wins).
+    Defaults for conflict/update/touch come from TABLES.
+    """
+    spec = TABLES.get(table, {})
+    conflict = conflict or spec.get('conflict')
+    if not conflict:
+        raise ValueError(f"No conflict key configured for table '{table}'")
+    update = spec.get('update') if update is None else update
+    touch = spec.get('touch', []) if touch is None else touch
+    
+    if df.empty:
+        return UpsertResult(0, 0, 0)
+    
+    staged = _prepare(df.drop_duplicates(subset=conflict, keep='last'))
+    columns = list(staged.columns)
+    staging = f"_stage_{table}"
+    
+    buf = io.StringIO()
+    staged.to_csv(buf, index=False, header=False, na_rep=NULL_MARKER)
+    buf.seek(0)
+    
+    with engine.begin() as conn:
+        cursor = conn.connection.cursor()
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+        cursor.copy_expert(
+            f"COPY {staging} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')",
+            buf
+        )
+        cursor.execute(_existing_sql(table, staging, conflict, spec.get('match_nulls', [])))
+        existing = cursor.fetchone()[0]
+        cursor.execute(_merge_sql(table, staging, columns, conflict, update, touch, spec.get('reset', [])))
+        changed = cursor.rowcount
+        cursor.close()
+        if changed and spec.get('topic'):
+            notify.publish(conn, spec['topic'])
+    
+    inserted = len(staged) - existing
+    updated = changed - inserted
+    return UpsertResult(inserted, updated, len(df) - inserted - updated)
@@ -5,6 +5,19 @@
 DROP TABLE IF EXISTS raw_google_trends CASCADE;
 DROP TABLE IF EXISTS raw_cdc_cases CASCADE;
 DROP TABLE IF EXISTS raw_news_articles CASCADE;
+DROP TABLE IF EXISTS story_clusters CASCADE;
+DROP TABLE IF EXISTS story_lsh_buckets CASCADE;
+DROP TABLE IF EXISTS news_sentiment CASCADE;
+DROP TABLE IF EXISTS sentiment_cache CASCADE;
+DROP TABLE IF EXISTS risk_assessment CASCADE;
+DROP TABLE IF EXISTS agg_trends_daily CASCADE;
+DROP TABLE IF EXISTS agg_sentiment_daily CASCADE;
+DROP TABLE IF EXISTS agg_sentiment_geo_daily CASCADE;
+DROP TABLE IF EXISTS agg_articles_daily CASCADE;
+DROP TABLE IF EXISTS source_state CASCADE;
+DROP TABLE IF EXISTS scheduler_state CASCADE;
+DROP TABLE IF EXISTS data_versions CASCADE;
+DROP TABLE IF EXISTS content_blobs CASCADE;
 
 -- Google Trends Data
 CREATE TABLE raw_google_trends (
@@ -14,49 +27,258 @@ CREATE TABLE raw_google_trends (
     search_interest INTEGER,
     keyword_group INTEGER,
     geo VARCHAR(10) DEFAULT 'US',
+    is_partial BOOLEAN NOT NULL DEFAULT FALSE,  -- today's still-moving value; refetched next run
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(date, keyword, geo)
 );
 
 CREATE INDEX idx_raw_trends_date ON raw_google_trends(date);
 CREATE INDEX idx_raw_trends_keyword ON raw_google_trends(keyword);
+CREATE INDEX idx_raw_trends_geo_keyword_date ON raw_google_trends(geo, keyword, date) WHERE NOT is_partial;
 
--- CDC Cases
+-- CDC Cases (monthly partitions on report_date, see partition_maintenance.py)
 CREATE TABLE raw_cdc_cases (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     scrape_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    report_date DATE,
+    report_date DATE NOT NULL,
     state VARCHAR(50),
     county VARCHAR(100),
     case_count INTEGER,
     source_url TEXT,
-    raw_html TEXT,
-    UNIQUE(report_date, state, county)
-);
+    raw_html TEXT,  -- 'gz:' + base64(gzip(page)), see run_cdc_scraper.pack_html()
+    raw_html_hash CHAR(64),  -- set once raw_html is moved to content_blobs
+    PRIMARY KEY (id, report_date),
+    -- NULLS NOT DISTINCT: national rows (county IS NULL) must still conflict
+    UNIQUE NULLS NOT DISTINCT (report_date, state, county)
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE raw_cdc_cases_default PARTITION OF raw_cdc_cases DEFAULT;
 
 CREATE INDEX idx_raw_cdc_report_date ON raw_cdc_cases(report_date);
 CREATE INDEX idx_raw_cdc_state ON raw_cdc_cases(state);
+-- Small partial indexes: finding what is left to offload never scans old months
+CREATE INDEX idx_raw_cdc_html_pending ON raw_cdc_cases(report_date) WHERE raw_html IS NOT NULL;
+CREATE INDEX idx_raw_cdc_html_hash ON raw_cdc_cases(raw_html_hash) WHERE raw_html_hash IS NOT NULL;
 
--- News Articles
+-- News Articles (monthly partitions on published_at, see partition_maintenance.py)
 CREATE TABLE raw_news_articles (
-    id SERIAL PRIMARY KEY,
-    article_url TEXT NOT NULL UNIQUE,
+    id SERIAL,
+    article_url TEXT NOT NULL,
     query_category VARCHAR(50),
     source_name VARCHAR(100),
     author VARCHAR(200),
     title TEXT,
     description TEXT,
     content TEXT,
-    published_at TIMESTAMP,
-    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    content_hash CHAR(64),  -- set once content is moved to content_blobs
+    published_at TIMESTAMP NOT NULL,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    story_cluster_id INTEGER,  -- id of the story's first article (story_clusters.py)
+    -- Full-text search (search.py), maintained by raw_news_search_vector() on every write
+    search_vector TSVECTOR,
+    -- Unique keys of a partitioned table must include the partition key
+    PRIMARY KEY (id, published_at),
+    UNIQUE (article_url, published_at)
+) PARTITION BY RANGE (published_at);
+
+CREATE TABLE raw_news_articles_default PARTITION OF raw_news_articles DEFAULT;
+
+-- title (weight A), description (B) and content (C). Once content has been
+-- moved to content_blobs (content NULL, content_hash set) the row's existing
+-- C lexemes are kept, so old articles stay searchable by their body text.
+CREATE OR REPLACE FUNCTION raw_news_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'B') ||
+        CASE WHEN NEW.content IS NULL AND NEW.content_hash IS NOT NULL
+             THEN ts_filter(COALESCE(NEW.search_vector, ''::tsvector), '{c}')
+             ELSE setweight(to_tsvector('english', COALESCE(NEW.content, '')), 'C')
+        END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_raw_news_search_vector
+    BEFORE INSERT OR UPDATE ON raw_news_articles
+    FOR EACH ROW EXECUTE FUNCTION raw_news_search_vector();
 
 CREATE INDEX idx_raw_news_category ON raw_news_articles(query_category);
 CREATE INDEX idx_raw_news_published ON raw_news_articles(published_at);
+CREATE INDEX idx_raw_news_story ON raw_news_articles(story_cluster_id);
+CREATE INDEX idx_raw_news_search ON raw_news_articles USING GIN (search_vector);
+CREATE INDEX idx_raw_news_content_pending ON raw_news_articles(published_at) WHERE content IS NOT NULL;
+CREATE INDEX idx_raw_news_content_hash ON raw_news_articles(content_hash) WHERE content_hash IS NOT NULL;
+
+-- Monthly partitions for the last year and the next three months (same names
+-- as partition_maintenance.py, which keeps creating them ahead of time)
+DO $$
+DECLARE
+    parent TEXT;
+    month DATE;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['raw_news_articles', 'raw_cdc_cases'] LOOP
+        FOR month IN SELECT generate_series(date_trunc('month', CURRENT_DATE) - INTERVAL '12 months',
+                                            date_trunc('month', CURRENT_DATE) + INTERVAL '3 months',
+                                            INTERVAL '1 month')::date
+        LOOP
+            EXECUTE 'CREATE TABLE ' || quote_ident(parent || '_p' || to_char(month, 'YYYYMM'))
+                 || ' PARTITION OF ' || parent
+                 || ' FOR VALUES FROM (' || quote_literal(month)
+                 || ') TO (' || quote_literal((month + INTERVAL '1 month')::date) || ')';
+        END LOOP;
+    END LOOP;
+END $$;
+
+-- Old article content and CDC pages, content-addressed (partition_maintenance.py)
+CREATE TABLE content_blobs (
+    sha256 CHAR(64) PRIMARY KEY,  -- of the uncompressed text
+    data BYTEA NOT NULL,          -- zlib-compressed UTF-8
+    size INTEGER NOT NULL,        -- uncompressed bytes
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Already compressed: store out of line without another pglz pass
+ALTER TABLE content_blobs ALTER COLUMN data SET STORAGE EXTERNAL;
+
+-- Near-duplicate stories: MinHash signature of each story's first article
+CREATE TABLE story_clusters (
+    cluster_id INTEGER PRIMARY KEY,
+    signature BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- LSH index over those signatures: (band, bucket) -> story that first hashed there
+CREATE TABLE story_lsh_buckets (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    cluster_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket)
+);
+
+-- News Sentiment (one row per scored article, upserted incrementally)
+CREATE TABLE news_sentiment (
+    article_id INTEGER NOT NULL,
+    model_name VARCHAR(50) NOT NULL DEFAULT 'textblob',  -- sentiment_models.MODELS key
+    model_version VARCHAR(50),
+    content_hash CHAR(32) NOT NULL,
+    sentiment_score DOUBLE PRECISION,
+    subjectivity_score DOUBLE PRECISION,
+    sentiment_label VARCHAR(20),
+    geos VARCHAR(10)[] NOT NULL DEFAULT '{}',  -- states mentioned, e.g. {US-TX,US-NM}
+    analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (article_id, model_name)
+);
+
+CREATE INDEX idx_news_sentiment_label ON news_sentiment(sentiment_label);
+
+-- Sentiment Cache (scores memoized by sha1 of normalized title+description)
+CREATE TABLE sentiment_cache (
+    text_hash CHAR(40) PRIMARY KEY,
+    sentiment_score DOUBLE PRECISION,
+    subjectivity_score DOUBLE PRECISION,
+    sentiment_label VARCHAR(20),
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_sentiment_cache_last_used ON sentiment_cache(last_used_at);
+
+-- Risk Assessment (one row per scored day; backfills replace their date range)
+CREATE TABLE risk_assessment (
+    id SERIAL PRIMARY KEY,
+    assessment_date DATE NOT NULL,
+    geo VARCHAR(10) NOT NULL DEFAULT 'US',  -- 'US' or a state, 'US-XX'
+    calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    risk_score DOUBLE PRECISION,
+    risk_level VARCHAR(10),
+    search_interest_score DOUBLE PRECISION,
+    case_growth_score DOUBLE PRECISION,
+    news_sentiment_score DOUBLE PRECISION,
+    total_articles_analyzed INTEGER,  -- stories (not syndicated copies) in the sentiment window
+    latest_case_count INTEGER
+);
+
+CREATE INDEX idx_risk_assessment_date ON risk_assessment(assessment_date);
+CREATE INDEX idx_risk_assessment_geo_date ON risk_assessment(geo, assessment_date DESC);
+
+-- Daily aggregates (maintained by aggregates.py after each ingest)
+CREATE TABLE agg_trends_daily (
+    date DATE NOT NULL,
+    keyword VARCHAR(100) NOT NULL,
+    geo_count INTEGER,
+    avg_interest DOUBLE PRECISION,
+    min_interest INTEGER,
+    max_interest INTEGER,
+    us_interest INTEGER,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (date, keyword)
+);
+
+CREATE TABLE agg_sentiment_daily (
+    date DATE PRIMARY KEY,
+    article_count INTEGER,
+    story_count INTEGER,  -- averages and label counts below are per story
+    avg_sentiment DOUBLE PRECISION,
+    avg_subjectivity DOUBLE PRECISION,
+    positive_count INTEGER,
+    negative_count INTEGER,
+    neutral_count INTEGER,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Same per state, from the geos each article mentions
+CREATE TABLE agg_sentiment_geo_daily (
+    date DATE NOT NULL,
+    geo VARCHAR(10) NOT NULL,
+    article_count INTEGER,
+    story_count INTEGER,
+    avg_sentiment DOUBLE PRECISION,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (date, geo)
+);
+
+CREATE TABLE agg_articles_daily (
+    date DATE NOT NULL,
+    source_name VARCHAR(100) NOT NULL,
+    query_category VARCHAR(50) NOT NULL,
+    article_count INTEGER,
+    story_count INTEGER,  -- articles that are the first copy of their story
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (date, source_name, query_category)
+);
+
+-- Conditional-fetch state per scraped source (HTTP validators + content hash)
+CREATE TABLE source_state (
+    source VARCHAR(50) PRIMARY KEY,
+    url TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash CHAR(64),
+    checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    changed_at TIMESTAMP
+);
+
+-- Last run of each scheduler.py job, so a restarted daemon resumes on time
+CREATE TABLE scheduler_state (
+    job VARCHAR(50) PRIMARY KEY,
+    last_started_at TIMESTAMP,
+    last_finished_at TIMESTAMP,
+    last_status VARCHAR(20),
+    last_changed_at TIMESTAMP,
+    next_run_at TIMESTAMP,
+    derived_pending BOOLEAN NOT NULL DEFAULT FALSE  -- changes not yet followed by sentiment/risk/archive
+);
+
+-- Change counter per topic, bumped by notify.publish() alongside NOTIFY biopulse_changes
+CREATE TABLE data_versions (
+    topic VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
 
 -- Success message
 DO $$
 BEGIN
     RAISE NOTICE '✅ BioPulse database schema initialized successfully!';
-    RAISE NOTICE '📊 Tables created: raw_google_trends, raw_cdc_cases, raw_news_articles';
+    RAISE NOTICE '📊 Tables created: raw_google_trends, raw_cdc_cases, raw_news_articles, story_clusters, story_lsh_buckets, news_sentiment, sentiment_cache, risk_assessment, agg_*_daily, source_state, scheduler_state, data_versions, content_blobs';
 END $$;
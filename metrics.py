@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Pipeline instrumentation
+Records wall time, rows fetched/written, HTTP latency per source, database
+query time and peak RSS for every stage and sub-step.
+
+Each finished stage is appended as one JSON line to METRICS_PATH
+(default logs/metrics.jsonl). If METRICS_PROMETHEUS_PATH is set, the latest
+value of every metric is also written there in Prometheus text format
+(for the node_exporter textfile collector).
+
+Usage:
+    with metrics.stage('newsapi.write'):
+        result = upsert_dataframe(...)
+        metrics.add_rows(written=result.inserted + result.updated)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from sqlalchemy import event
+
+METRICS_PATH = os.getenv('METRICS_PATH', str(Path(__file__).resolve().parent / 'logs' / 'metrics.jsonl'))
+PROMETHEUS_PATH = os.getenv('METRICS_PROMETHEUS_PATH')
+RUN_ID = os.getenv('METRICS_RUN_ID', uuid.uuid4().hex[:12])
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_latest = {}    # (metric, labels) -> value, for the Prometheus file
+
+class StageMetrics:
+    """Counters for one running stage"""
+    
+    def __init__(self, name, parent, labels):
+        self.name = name
+        self.parent = parent
+        self.labels = labels
+        self.started = time.perf_counter()
+        self.rows_fetched = 0
+        self.rows_written = 0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.http = {}
+    
+    def to_record(self, status, error=None):
+        record = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'run_id': RUN_ID,
+            'stage': self.name,
+            'parent': self.parent,
+            'status': status,
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'rows_fetched': self.rows_fetched,
+            'rows_written': self.rows_written,
+            'db_queries': self.db_queries,
+            'db_seconds': round(self.db_seconds, 6),
+            'http': {
+                source: dict(stats, total_seconds=round(stats['total_seconds'], 6), max_seconds=round(stats['max_seconds'], 6))
+                for source, stats in self.http.items()
+            },
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if self.labels:
+            record['labels'] = self.labels
+        if error is not None:
+            record['error'] = repr(error)[:500]
+        return record
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    divisor = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+    return round(peak / divisor, 1)
+
+@contextmanager
+def stage(name, **labels):
+    """Time a stage; counters recorded inside it also count toward enclosing stages"""
+    stack = _stack()
+    current = StageMetrics(name, stack[-1].name if stack else None, labels)
+    stack.append(current)
+    status, error = 'ok', None
+    try:
+        yield current
+    except BaseException as e:
+        status, error = 'error', e
+        raise
+    finally:
+        stack.pop()
+        emit(current.to_record(status, error))
+
+def timed(name):
+    """Decorator form of stage(); a returned DataFrame counts as rows fetched"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                result = func(*args, **kwargs)
+                if hasattr(result, 'shape'):
+                    add_rows(fetched=len(result))
+                return result
+        return wrapper
+    return decorator
+
+def propagate(func):
+    """
+    Wrap func so that, when run on another thread, its counters still count
+    toward the stages open here (e.g. a fetcher thread feeding this one).
+    """
+    stages = list(_stack())
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.stack = list(stages)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.stack = []
+    return wrapper
+
+def add_rows(fetched=0, written=0):
+    for s in _stack():
+        s.rows_fetched += fetched
+        s.rows_written += written
+
+def record_http(source, seconds, status=None):
+    """One HTTP request's latency (and status code) for `source`"""
+    for s in _stack():
+        stats = s.http.setdefault(source, {'requests': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        stats['requests'] += 1
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        if status is None or status >= 400:
+            stats['errors'] += 1
+
+def _record_query(seconds):
+    for s in _stack():
+        s.db_queries += 1
+        s.db_seconds += seconds
+
+def instrument_engine(engine):
+    """Attribute every statement's execution time to the stages running on that thread"""
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_metrics_started', []).append(time.perf_counter())
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('_metrics_started')
+        if started:
+            _record_query(time.perf_counter() - started.pop())
+    
+    return engine
+
+def emit(record):
+    """Append one JSON line and refresh the Prometheus file"""
+    with _write_lock:
+        try:
+            path = Path(METRICS_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        except OSError as e:
+            print(f"⚠️ Could not write metrics: {e}")
+        
+        if PROMETHEUS_PATH:
+            _update_latest(record)
+            _write_prometheus(PROMETHEUS_PATH)
+
+def _update_latest(record):
+    stage_label = (('stage', record['stage']),)
+    _latest[('biopulse_stage_duration_seconds', stage_label)] = record['wall_seconds']
+    _latest[('biopulse_stage_rows_fetched', stage_label)] = record['rows_fetched']
+    _latest[('biopulse_stage_rows_written', stage_label)] = record['rows_written']
+    _latest[('biopulse_stage_db_queries', stage_label)] = record['db_queries']
+    _latest[('biopulse_stage_db_seconds', stage_label)] = record['db_seconds']
+    _latest[('biopulse_stage_success', stage_label)] = 1 if record['status'] == 'ok' else 0
+    _latest[('biopulse_stage_last_run_timestamp', stage_label)] = time.time()
+    if record['peak_rss_mb'] is not None:
+        _latest[('biopulse_process_peak_rss_bytes', ())] = int(record['peak_rss_mb'] * 1024 * 1024)
+    for source, stats in record['http'].items():
+        labels = stage_label + (('source', source),)
+        _latest[('biopulse_http_requests', labels)] = stats['requests']
+        _latest[('biopulse_http_errors', labels)] = stats['errors']
+        _latest[('biopulse_http_seconds_total', labels)] = stats['total_seconds']
+        _latest[('biopulse_http_seconds_max', labels)] = stats['max_seconds']
+
+def _write_prometheus(path):
+    lines = []
+    for metric in sorted({m for m, _ in _latest}):
+        lines.append(f"# TYPE {metric} gauge")
+        for (name, labels), value in sorted(_latest.items()):
+            if name != metric:
+                continue
+            label_str = ','.join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+    try:
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ Could not write Prometheus metrics: {e}")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Change events from writers to readers
+Every write that changes what the dashboard shows bumps a per-topic counter
+in data_versions and sends NOTIFY biopulse_changes '<topic>' in the same
+transaction, so readers hear about it exactly when the data is committed.
+The dashboard keys its caches on these versions (see VersionListener).
+"""
+
+import select
+import threading
+import time
+from sqlalchemy import text
+from db import get_engine
+
+CHANNEL = 'biopulse_changes'
+
+# What each topic covers
+TOPICS = {
+    'trends': 'raw_google_trends, agg_trends_daily',
+    'cdc': 'raw_cdc_cases',
+    'news': 'raw_news_articles, agg_articles_daily',
+    'sentiment': 'news_sentiment, agg_sentiment_daily, agg_sentiment_geo_daily',
+    'risk': 'risk_assessment',
+}
+
+PUBLISH_SQL = text("""
+INSERT INTO data_versions (topic, version, changed_at)
+VALUES (:topic, 1, now())
+ON CONFLICT (topic) DO UPDATE SET
+    version = data_versions.version + 1,
+    changed_at = now()
+""")
+
+VERSIONS_SQL = "SELECT topic, version FROM data_versions"
+
+def publish(conn, *topics):
+    """
+    Record a change to `topics` on an open connection. Call it inside the
+    writing transaction: the NOTIFY is only delivered if that commits.
+    """
+    for topic in topics:
+        conn.execute(PUBLISH_SQL, {'topic': topic})
+        conn.execute(text("SELECT pg_notify(:channel, :topic)"), {'channel': CHANNEL, 'topic': topic})
+
+def current_versions(engine=None):
+    """{topic: version} for every known topic (0 if never published)"""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(VERSIONS_SQL).fetchall()
+    versions = dict.fromkeys(TOPICS, 0)
+    versions.update({topic: version for topic, version in rows})
+    return versions
+
+class VersionListener:
+    """
+    Background thread that LISTENs on CHANNEL and keeps an up-to-date copy
+    of data_versions. Readers call versions() for free; the database is
+    only queried when a notification arrives (or after reconnecting).
+    """
+    
+    def __init__(self, engine=None, reconnect_delay=5):
+        self.engine = engine or get_engine()
+        self.reconnect_delay = reconnect_delay
+        self._versions = dict.fromkeys(TOPICS, 0)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='biopulse-listener', daemon=True)
+    
+    def start(self):
+        # Seed synchronously so the first reader doesn't see all zeros
+        try:
+            with self._lock:
+                self._versions.update(current_versions(self.engine))
+        except Exception as e:
+            print(f"⚠️ Could not read data versions: {e}")
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+    
+    def versions(self):
+        with self._lock:
+            return dict(self._versions)
+    
+    def _connect(self):
+        # A dedicated connection, detached so it doesn't hold a pool slot
+        raw = self.engine.raw_connection()
+        raw.detach()
+        conn = raw.connection
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CHANNEL}")
+        return conn
+    
+    def _reload(self, conn):
+        with conn.cursor() as cur:
+            cur.execute(VERSIONS_SQL)
+            rows = cur.fetchall()
+        with self._lock:
+            self._versions.update({topic: version for topic, version in rows})
+    
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                # Anything missed while disconnected
+                self._reload(conn)
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self._reload(conn)
+            except Exception as e:
+                print(f"⚠️ Change listener disconnected, retrying in {self.reconnect_delay}s: {e}")
+                time.sleep(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
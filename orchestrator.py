@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+In-process pipeline orchestrator
+Runs pipeline steps concurrently in one interpreter, sharing one database
+engine, and starts each step as soon as the steps it depends on succeed.
+"""
+
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime
+from db import get_engine
+
+import run_google_trends
+import run_cdc_scraper
+import run_newsapi_scraper
+import sentiment_analysis
+import calculate_risk_score
+import archive
+import partition_maintenance
+
+class Step:
+    """
+    One unit of pipeline work.
+    - func: called as func(engine=engine); raising marks the attempt failed
+    - depends_on: names of steps that must succeed first (skipped otherwise)
+    - after: names of steps that must finish first, whatever their outcome
+    - timeout: seconds per attempt (None = no limit)
+    - retries: extra attempts after a failure (a timed-out attempt may still
+      be running, so timeouts are not retried)
+    """
+    
+    def __init__(self, name, func, depends_on=(), after=(), timeout=None, retries=0, retry_delay=5):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+class StepResult:
+    def __init__(self, status, attempts=0, duration=0.0, error=None, value=None):
+        self.status = status      # 'success', 'failed', 'timeout' or 'skipped'
+        self.attempts = attempts
+        self.duration = duration
+        self.error = error
+        self.value = value
+    
+    @property
+    def ok(self):
+        return self.status == 'success'
+
+def scraper_steps():
+    """The three independent collectors"""
+    return [
+        Step("Google Trends", run_google_trends.main, timeout=600, retries=1),
+        Step("CDC Cases", run_cdc_scraper.main, timeout=60, retries=2),
+        Step("NewsAPI", run_newsapi_scraper.main, timeout=120, retries=2),
+    ]
+
+def pipeline_steps():
+    """
+    Collection → sentiment analysis → risk scoring → Parquet archive → partition maintenance
+    Each stage waits for the previous one but runs whatever its outcome: a
+    failed collector leaves its stored data in place, and scoring, archiving
+    and upkeep work from whatever is stored.
+    """
+    return scraper_steps() + [
+        Step("Sentiment Analysis", sentiment_analysis.main,
+             after=["NewsAPI"], timeout=600),
+        Step("Risk Scoring", calculate_risk_score.calculate_risk_score,
+             after=["Google Trends", "CDC Cases", "Sentiment Analysis"], timeout=120),
+        Step("Archive", archive.main, after=["Risk Scoring"], timeout=300),
+        Step("Partition Maintenance", partition_maintenance.main, after=["Archive"], timeout=600),
+    ]
+
+def _thread_name(name):
+    return f"step-{name}"
+
+def still_running(name):
+    """Is an attempt of step `name` still running in this process (e.g. one abandoned after a timeout)?"""
+    return any(t.name == _thread_name(name) and t.is_alive() for t in threading.enumerate())
+
+def _start_attempt(step, attempt, engine, done):
+    """Run one attempt on a daemon thread; report (name, attempt, ok, value) to `done`"""
+    def target():
+        try:
+            value = step.func(engine=engine)
+            done.put((step.name, attempt, True, value))
+        except Exception as e:
+            traceback.print_exc()
+            done.put((step.name, attempt, False, e))
+    
+    thread = threading.Thread(target=target, name=_thread_name(step.name), daemon=True)
+    thread.start()
+
+def run_steps(steps, engine=None):
+    """
+    Run steps respecting depends_on and after, concurrently where possible.
+    Returns {step name: StepResult} in declaration order.
+
+    A timed-out attempt is abandoned (threads cannot be killed) and the step
+    ends as 'timeout' without a retry: a second attempt would run alongside
+    the first, both writing the same rows. Steps whose dependencies did not
+    succeed are skipped.
+    """
+    by_name = {s.name: s for s in steps}
+    for step in steps:
+        missing = [d for d in step.depends_on + step.after if d not in by_name]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps: {missing}")
+    
+    engine = engine or get_engine()
+    
+    done = queue.Queue()
+    results = {}
+    running = {}          # name -> (attempt number, attempt deadline, first start time)
+    waiting_retry = {}    # name -> (attempt number, time the retry may start, first start time)
+    pending = [s.name for s in steps]
+    
+    def finish(name, status, attempts, started, error=None, value=None):
+        results[name] = StepResult(status, attempts, time.monotonic() - started, error, value)
+    
+    def launch(name, attempt, started):
+        step = by_name[name]
+        deadline = time.monotonic() + step.timeout if step.timeout else None
+        running[name] = (attempt, deadline, started)
+        print(f"▶️  {name} started" + (f" (attempt {attempt})" if attempt > 1 else ""))
+        _start_attempt(step, attempt, engine, done)
+    
+    def fail_or_retry(name, status, error):
+        attempt, _, started = running.pop(name)
+        step = by_name[name]
+        if attempt <= step.retries:
+            print(f"🔁 {name} {status} on attempt {attempt}, retrying in {step.retry_delay}s")
+            waiting_retry[name] = (attempt + 1, time.monotonic() + step.retry_delay, started)
+        else:
+            finish(name, status, attempt, started, error=error)
+    
+    while pending or running or waiting_retry:
+        # Start (or skip) steps whose dependencies are settled
+        for name in list(pending):
+            deps = by_name[name].depends_on
+            if any(d in results and not results[d].ok for d in deps):
+                pending.remove(name)
+                results[name] = StepResult('skipped')
+                print(f"⏭️  {name} skipped (dependency failed)")
+            elif all(d in results for d in deps + by_name[name].after):
+                pending.remove(name)
+                launch(name, 1, time.monotonic())
+        
+        now = time.monotonic()
+        for name, (attempt, start_at, started) in list(waiting_retry.items()):
+            if now >= start_at:
+                del waiting_retry[name]
+                launch(name, attempt, started)
+        
+        if not running and not waiting_retry:
+            if pending:
+                raise ValueError(f"Circular dependencies between steps: {pending}")
+            break
+        
+        # Sleep until a step finishes or the nearest deadline/retry time
+        wakeups = [d for _, d, _ in running.values() if d] + [t for _, t, _ in waiting_retry.values()]
+        wait = max(0.0, min(wakeups) - time.monotonic()) if wakeups else None
+        try:
+            name, attempt, ok, value = done.get(timeout=wait)
+        except queue.Empty:
+            name = None
+        
+        # Ignore late results from attempts that already timed out
+        if name in running and running[name][0] == attempt:
+            started = running[name][2]
+            if ok:
+                running.pop(name)
+                finish(name, 'success', attempt, started, value=value)
+                print(f"✅ {name} completed in {results[name].duration:.1f}s")
+            else:
+                print(f"❌ {name} failed: {value}")
+                fail_or_retry(name, 'failed', value)
+        
+        now = time.monotonic()
+        for name, (attempt, deadline, started) in list(running.items()):
+            if deadline and now >= deadline:
+                print(f"⏱️ {name} timed out after {by_name[name].timeout}s, not retrying (attempt still running)")
+                running.pop(name)
+                finish(name, 'timeout', attempt, started, error=TimeoutError(f"{name} timed out"))
+    
+    return {s.name: results[s.name] for s in steps}
+
+def print_summary(title, results):
+    """Print a per-step status table; returns the number of successful steps"""
+    print(f"\n{'='*60}")
+    print(f"📊 {title}")
+    print(f"{'='*60}")
+    
+    for name, result in results.items():
+        status = "✅ SUCCESS" if result.ok else f"❌ {result.status.upper()}"
+        detail = f" ({result.duration:.1f}s, {result.attempts} attempt{'s' if result.attempts != 1 else ''})" if result.attempts else ""
+        print(f"{status}: {name}{detail}")
+    
+    return sum(r.ok for r in results.values())
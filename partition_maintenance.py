@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Partition maintenance for raw_news_articles and raw_cdc_cases
+Both tables are range-partitioned by month (published_at / report_date) with a
+DEFAULT partition catching anything outside the monthly ones. Each run:
+
+1. creates the monthly partitions PARTITIONS_AHEAD months ahead, and moves rows
+   that landed in the default partition into partitions of their own
+2. moves content / raw_html older than CONTENT_OFFLOAD_DAYS into content_blobs
+   (compressed, one copy per distinct value), keeping only the hash
+3. drops partitions older than the table's retention (NEWS_RETENTION_MONTHS,
+   CDC_RETENTION_MONTHS; 0 keeps everything). With RETENTION_ACTION=archive
+   (the default) the Parquet archive is brought up to date first.
+
+Queries that filter on the partition key ("last 7 days") only touch the
+partitions they need, however many months are retained.
+Run: python partition_maintenance.py [--status]
+"""
+
+import argparse
+import os
+import re
+from datetime import date, datetime, timedelta
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine
+import archive
+import content_blobs
+import metrics
+import notify
+from run_cdc_scraper import unpack_html
+
+PARTITIONS_AHEAD = 3
+CONTENT_OFFLOAD_DAYS = int(os.getenv('CONTENT_OFFLOAD_DAYS', '90'))
+RETENTION_ACTION = os.getenv('RETENTION_ACTION', 'archive')   # 'archive' or 'drop'
+OFFLOAD_CHUNK_ROWS = 1000
+
+# Per table: partition key (and its SQL type), the bulky column moved to
+# content_blobs and where its hash goes, retention, the archive datasets
+# exported before dropping, and the change topic.
+PARTITIONED = {
+    'raw_news_articles': {
+        'key': 'published_at',
+        'key_type': 'timestamp',
+        'bulky': 'content',
+        'hash': 'content_hash',
+        'retention_months': int(os.getenv('NEWS_RETENTION_MONTHS', '24')),
+        'archive': ['raw_news_articles', 'news_sentiment'],
+        'topic': 'news',
+    },
+    'raw_cdc_cases': {
+        'key': 'report_date',
+        'key_type': 'date',
+        'bulky': 'raw_html',
+        'hash': 'raw_html_hash',
+        'retention_months': int(os.getenv('CDC_RETENTION_MONTHS', '0')),
+        'archive': ['raw_cdc_cases'],
+        'topic': 'cdc',
+    },
+}
+
+PARTITIONS_SQL = text("""
+SELECT c.relname
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = CAST(:table AS regclass)
+""")
+
+COLUMNS_SQL = text("""
+SELECT column_name
+FROM information_schema.columns
+WHERE table_schema = 'public' AND table_name = :table AND is_generated = 'NEVER'
+ORDER BY ordinal_position
+""")
+
+STATUS_SQL = text("""
+SELECT p.relname AS table_name, c.relname AS partition, NULLIF(c.reltuples, -1)::bigint AS approx_rows,
+       pg_size_pretty(pg_total_relation_size(c.oid)) AS size
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+JOIN pg_class p ON p.oid = i.inhparent
+WHERE p.relname = ANY(:tables)
+ORDER BY p.relname, c.relname
+""")
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+def default_partition(table):
+    return f"{table}_default"
+
+def existing_partitions(conn, table):
+    """{first day of month: partition name} for the monthly partitions"""
+    pattern = re.compile(rf'^{table}_p(\d{{4}})(\d{{2}})$')
+    months = {}
+    for (name,) in conn.execute(PARTITIONS_SQL, {'table': table}):
+        match = pattern.match(name)
+        if match:
+            months[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return months
+
+def create_partition(conn, table, month):
+    """
+    Create the partition for `month`. Rows for that month already sitting in
+    the default partition are moved into it (PostgreSQL refuses to create a
+    partition whose range the default partition still holds).
+    """
+    spec = PARTITIONED[table]
+    key, name, default = spec['key'], partition_name(table, month), default_partition(table)
+    bounds = {'lo': month, 'hi': add_months(month, 1)}
+    in_range = f"{key} >= :lo AND {key} < :hi"
+    
+    stranded = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"), bounds).scalar()
+    create = f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ('{bounds['lo']}') TO ('{bounds['hi']}')"
+    if not stranded:
+        conn.execute(text(create))
+        return 0
+    
+    # search_vector is copied too: the trigger keeps an offloaded body's lexemes
+    columns = ', '.join(row[0] for row in conn.execute(COLUMNS_SQL, {'table': table}))
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    conn.execute(text(create))
+    moved = conn.execute(text(f"""
+        WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING {columns})
+        INSERT INTO {table} ({columns}) SELECT {columns} FROM moved
+    """), bounds).rowcount
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    return moved
+
+@metrics.timed('partitions.create')
+def ensure_partitions(engine=None, tables=None, start=None, ahead=PARTITIONS_AHEAD):
+    """
+    Create missing monthly partitions from `start` (default: this month) to
+    `ahead` months from now, plus any month with rows in the default partition.
+    Returns {table: [months created]}.
+    """
+    engine = engine or get_engine()
+    this_month = month_start(datetime.now().date())
+    first = month_start(start) if start else this_month
+    wanted = set()
+    month = first
+    while month <= add_months(this_month, ahead):
+        wanted.add(month)
+        month = add_months(month, 1)
+    
+    created = {}
+    for table in tables or PARTITIONED:
+        key = PARTITIONED[table]['key']
+        with engine.begin() as conn:
+            existing = existing_partitions(conn, table)
+            stranded = {d for (d,) in conn.execute(text(
+                f"SELECT DISTINCT CAST(date_trunc('month', {key}) AS date) FROM {default_partition(table)}"))}
+        created[table] = []
+        for month in sorted((wanted | stranded) - set(existing)):
+            # One transaction per partition keeps the default partition's lock short
+            with engine.begin() as conn:
+                moved = create_partition(conn, table, month)
+            created[table].append(month)
+            if moved:
+                print(f"   {partition_name(table, month)}: moved {moved:,} rows out of the default partition")
+    return created
+
+@metrics.timed('partitions.offload')
+def offload_content(engine=None, table='raw_news_articles', older_than_days=CONTENT_OFFLOAD_DAYS):
+    """
+    Move the bulky column of rows older than `older_than_days` into
+    content_blobs, leaving its hash. Returns the number of rows offloaded.
+    """
+    if older_than_days <= 0:
+        return 0
+    engine = engine or get_engine()
+    spec = PARTITIONED[table]
+    key, bulky, hash_col = spec['key'], spec['bulky'], spec['hash']
+    cutoff = datetime.now().date() - timedelta(days=older_than_days)
+    
+    # The partial index on (key) WHERE bulky IS NOT NULL only holds rows left to do
+    select = text(f"""
+        SELECT id, {key}, {bulky} FROM {table}
+        WHERE {key} < :cutoff AND {bulky} IS NOT NULL
+        ORDER BY {key}
+        LIMIT :limit
+    """)
+    update = text(f"""
+        UPDATE {table} t
+        SET {bulky} = NULL, {hash_col} = a.hash
+        FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS {spec['key_type']}[]), CAST(:hashes AS char(64)[]))
+             AS a(id, key, hash)
+        WHERE t.id = a.id AND t.{key} = a.key
+    """)
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(select, {'cutoff': cutoff, 'limit': OFFLOAD_CHUNK_ROWS}).fetchall()
+            if not rows:
+                break
+            values = [unpack_html(r[2]) if bulky == 'raw_html' else r[2] for r in rows]
+            hashes = content_blobs.store(conn, values)
+            conn.execute(update, {'ids': [r[0] for r in rows], 'keys': [r[1] for r in rows], 'hashes': hashes})
+            if bulky == 'content':
+                # Search results change (content no longer feeds search_vector)
+                notify.publish(conn, spec['topic'])
+        total += len(rows)
+        metrics.add_rows(fetched=len(rows), written=len(rows))
+    return total
+
+def _drop_partition(conn, table, name):
+    """Drop one partition, its sentiment rows and blobs nothing else uses"""
+    spec = PARTITIONED[table]
+    hashes = [h for (h,) in conn.execute(text(
+        f"SELECT DISTINCT {spec['hash']} FROM {name} WHERE {spec['hash']} IS NOT NULL"))]
+    if table == 'raw_news_articles':
+        conn.execute(text(f"DELETE FROM news_sentiment s USING {name} n WHERE s.article_id = n.id"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    if hashes:
+        conn.execute(text(f"""
+            DELETE FROM content_blobs b
+            WHERE b.sha256 = ANY(:hashes)
+              AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{spec['hash']} = b.sha256)
+        """), {'hashes': hashes})
+    notify.publish(conn, spec['topic'])
+
+@metrics.timed('partitions.retention')
+def apply_retention(engine=None, table='raw_news_articles', months=None, action=RETENTION_ACTION):
+    """
+    Drop monthly partitions that ended more than `months` months ago
+    (0 keeps everything). Daily aggregates for those days are kept.
+    Returns the names of the dropped partitions.
+    """
+    spec = PARTITIONED[table]
+    months = spec['retention_months'] if months is None else months
+    if months <= 0:
+        return []
+    if action not in ('archive', 'drop'):
+        raise ValueError(f"RETENTION_ACTION must be 'archive' or 'drop', not '{action}'")
+    engine = engine or get_engine()
+    cutoff = add_months(month_start(datetime.now().date()), -months)
+    with engine.connect() as conn:
+        expired = [name for month, name in sorted(existing_partitions(conn, table).items()) if month < cutoff]
+    if not expired:
+        return []
+    
+    if action == 'archive':
+        # Whatever changed since the last pipeline run, before it disappears
+        archive.main(engine=engine, tables=spec['archive'])
+    for name in expired:
+        with engine.begin() as conn:
+            _drop_partition(conn, table, name)
+        print(f"   🗑️ Dropped {name}" + (" (archived)" if action == 'archive' else ""))
+    return expired
+
+def status(engine=None):
+    """Partitions of each table with approximate rows and size"""
+    engine = engine or get_engine()
+    return pd.read_sql(STATUS_SQL, engine, params={'tables': list(PARTITIONED)})
+
+@metrics.timed('partitions')
+def main(engine=None):
+    print("🗂️ Maintaining partitions...")
+    engine = engine or get_engine()
+    
+    created = ensure_partitions(engine)
+    summary = {}
+    for table in PARTITIONED:
+        offloaded = offload_content(engine, table)
+        dropped = apply_retention(engine, table)
+        summary[table] = {'created': len(created[table]), 'offloaded': offloaded, 'dropped': len(dropped)}
+        print(f"   {table}: {len(created[table])} partitions created, {offloaded:,} rows offloaded "
+              f"to content_blobs, {len(dropped)} partitions dropped")
+    
+    print("✅ Partition maintenance complete")
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Create, compact and expire monthly partitions")
+    parser.add_argument('--status', action='store_true', help="list partitions with sizes instead")
+    args = parser.parse_args()
+    
+    if args.status:
+        print(status().to_string(index=False))
+    else:
+        main()
@@ -1,9 +1,12 @@
 #!/bin/bash
 # Daily BioPulse Data Collection Script
 # This script runs all scrapers and logs results
+# (for continuous collection use the scheduler daemon: python scheduler.py)
 
-# Set paths
-PROJECT_DIR="/Users/mac/measles-biopulse"
+# Set paths: the project is wherever this script lives; override the
+# interpreter with PYTHON=/path/to/python
+PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PYTHON="${PYTHON:-python3}"
 LOG_DIR="$PROJECT_DIR/logs"
 LOG_FILE="$LOG_DIR/scraper_$(date +%Y%m%d).log"
 
@@ -25,17 +28,17 @@ cd "$PROJECT_DIR" || exit 1
 
 # Run all scrapers
 log_message "Running Google Trends scraper..."
-/opt/anaconda3/bin/python run_google_trends.py >> "$LOG_FILE" 2>&1
+"$PYTHON" run_google_trends.py >> "$LOG_FILE" 2>&1
 TRENDS_EXIT=$?
 log_message "Google Trends completed with exit code: $TRENDS_EXIT"
 
 log_message "Running CDC scraper..."
-/opt/anaconda3/bin/python run_cdc_scraper.py >> "$LOG_FILE" 2>&1
+"$PYTHON" run_cdc_scraper.py >> "$LOG_FILE" 2>&1
 CDC_EXIT=$?
 log_message "CDC scraper completed with exit code: $CDC_EXIT"
 
 log_message "Running NewsAPI scraper..."
-/opt/anaconda3/bin/python run_newsapi_scraper.py >> "$LOG_FILE" 2>&1
+"$PYTHON" run_newsapi_scraper.py >> "$LOG_FILE" 2>&1
 NEWS_EXIT=$?
 log_message "NewsAPI scraper completed with exit code: $NEWS_EXIT"
 
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+BioPulse scheduler daemon
+Keeps one warm process (imports loaded, one pooled engine) and runs each
+collector on its own interval: news every 15 minutes, Google Trends hourly,
+CDC daily. Sentiment analysis and risk scoring only run after a collector
+actually wrote new or changed rows.
+
+Last-run state lives in scheduler_state, so a restart resumes on schedule
+instead of re-running everything. A collector's changes stay marked
+derived_pending until the follow-up steps succeed; failed follow-ups are
+retried (also after a restart) without waiting for new data. SIGTERM / SIGINT finish the current run
+and exit cleanly.
+Run: python scheduler.py [--once]
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine, dispose_engine
+from ingest import UpsertResult
+from orchestrator import Step, run_steps, scraper_steps, print_summary, still_running
+import sentiment_analysis
+import calculate_risk_score
+import archive
+import partition_maintenance
+
+# Seconds between runs per collector (orchestrator step names)
+INTERVALS = {
+    'NewsAPI': int(os.getenv('SCHEDULE_NEWS_SECONDS', 15 * 60)),
+    'Google Trends': int(os.getenv('SCHEDULE_TRENDS_SECONDS', 60 * 60)),
+    'CDC Cases': int(os.getenv('SCHEDULE_CDC_SECONDS', 24 * 60 * 60)),
+}
+FAILURE_RETRY_SECONDS = 5 * 60   # a failed collector is retried sooner than its interval
+MAX_SLEEP_SECONDS = 60           # re-check at least this often
+
+SAVE_STATE_SQL = text("""
+INSERT INTO scheduler_state (job, last_started_at, last_finished_at, last_status, last_changed_at, next_run_at, derived_pending)
+VALUES (:job, :last_started_at, :last_finished_at, :last_status, :last_changed_at, :next_run_at, :derived_pending)
+ON CONFLICT (job) DO UPDATE SET
+    last_started_at = EXCLUDED.last_started_at,
+    last_finished_at = EXCLUDED.last_finished_at,
+    last_status = EXCLUDED.last_status,
+    last_changed_at = COALESCE(EXCLUDED.last_changed_at, scheduler_state.last_changed_at),
+    next_run_at = EXCLUDED.next_run_at,
+    derived_pending = scheduler_state.derived_pending OR EXCLUDED.derived_pending
+""")
+
+CLEAR_PENDING_SQL = text("""
+UPDATE scheduler_state SET derived_pending = FALSE
+WHERE job = ANY(:jobs) AND last_changed_at <= :started
+""")
+
+def load_state(engine):
+    """
+    ({job: next_run_at}, {jobs whose changes still need derived steps})
+    from the previous process (empty if none)
+    """
+    try:
+        df = pd.read_sql("SELECT job, next_run_at, derived_pending FROM scheduler_state", engine)
+    except Exception as e:
+        print(f"⚠️ Could not read scheduler state, running every job now: {e}")
+        return {}, set()
+    next_run = {row['job']: row['next_run_at'].to_pydatetime() for _, row in df.iterrows()
+                if pd.notna(row['next_run_at'])}
+    return next_run, set(df.loc[df['derived_pending'], 'job'])
+
+def save_state(engine, records):
+    with engine.begin() as conn:
+        conn.execute(SAVE_STATE_SQL, records)
+
+def clear_pending(engine, jobs, started):
+    """Derived steps started at `started` covered these jobs' changes"""
+    with engine.begin() as conn:
+        conn.execute(CLEAR_PENDING_SQL, {'jobs': list(jobs), 'started': started})
+
+def changed(result):
+    """Did a step's return value report written rows?"""
+    value = result.value if result.ok else None
+    return isinstance(value, UpsertResult) and (value.inserted + value.updated) > 0
+
+def derived_steps(changed_jobs):
+    """Sentiment (after new news), then risk, archive and partition upkeep (after any new input)"""
+    steps = []
+    if 'NewsAPI' in changed_jobs:
+        # The news collector scores each batch it writes; this picks up
+        # anything it missed (e.g. a batch whose scoring failed)
+        steps.append(Step("Sentiment Analysis", sentiment_analysis.main, timeout=600))
+    if changed_jobs:
+        steps.append(Step("Risk Scoring", calculate_risk_score.calculate_risk_score,
+                          after=[s.name for s in steps], timeout=120))
+        steps.append(Step("Archive", archive.main, after=["Risk Scoring"], timeout=300))
+        steps.append(Step("Partition Maintenance", partition_maintenance.main, after=["Archive"], timeout=600))
+    return steps
+
+class Scheduler:
+    def __init__(self, engine=None, intervals=None):
+        self.engine = engine or get_engine()
+        self.intervals = intervals or INTERVALS
+        self.steps = {s.name: s for s in scraper_steps() if s.name in self.intervals}
+        next_run, pending = load_state(self.engine)
+        self.next_run = {name: datetime.min for name in self.steps}
+        self.next_run.update({k: v for k, v in next_run.items() if k in self.steps})
+        # Collectors whose changes the derived steps have not yet covered,
+        # and when to retry those steps after a failure
+        self.pending = pending & set(self.steps)
+        self.derived_retry_at = datetime.min
+        self.stop = threading.Event()
+    
+    def due(self, now=None):
+        """
+        Collectors whose next run has come, except any whose timed-out attempt
+        is still running: a second copy would hit the same source and table.
+        """
+        now = now or datetime.now()
+        due = []
+        for name in self.steps:
+            if self.next_run[name] > now:
+                continue
+            if still_running(name):
+                print(f"⏳ {name} is due but its timed-out run is still going, checking again shortly")
+                self.next_run[name] = now + timedelta(seconds=MAX_SLEEP_SECONDS)
+                continue
+            due.append(name)
+        return due
+    
+    def derived_due(self, now=None):
+        now = now or datetime.now()
+        if not self.pending or self.derived_retry_at > now:
+            return False
+        if any(still_running(step.name) for step in derived_steps(self.pending)):
+            self.derived_retry_at = now + timedelta(seconds=MAX_SLEEP_SECONDS)
+            return False
+        return True
+    
+    def run_due(self):
+        """Run every due collector, then whatever their changes (and earlier failed follow-ups) require"""
+        due = self.due()
+        if not due and not self.derived_due():
+            return {}
+        
+        started = datetime.now()
+        results = {}
+        if due:
+            print(f"\n⏰ {started:%Y-%m-%d %H:%M:%S} running: {', '.join(due)}")
+            results = run_steps([self.steps[name] for name in due], self.engine)
+        else:
+            print(f"\n⏰ {started:%Y-%m-%d %H:%M:%S} retrying follow-up steps for: {', '.join(sorted(self.pending))}")
+        finished = datetime.now()
+        
+        changed_jobs = [name for name, result in results.items() if changed(result)]
+        records = []
+        for name, result in results.items():
+            # Failures come back sooner; a timeout waits the full interval, as
+            # its abandoned attempt may still be working through the source
+            retry = self.intervals[name] if result.status in ('success', 'timeout') else min(self.intervals[name], FAILURE_RETRY_SECONDS)
+            self.next_run[name] = started + timedelta(seconds=retry)
+            records.append({
+                'job': name,
+                'last_started_at': started,
+                'last_finished_at': finished,
+                'last_status': result.status,
+                'last_changed_at': finished if name in changed_jobs else None,
+                'next_run_at': self.next_run[name],
+                'derived_pending': name in changed_jobs,
+            })
+        if records:
+            # Marks the changes pending in the same write, so a crash before
+            # the follow-up steps finish still leaves them to be redone
+            save_state(self.engine, records)
+        self.pending.update(changed_jobs)
+        
+        follow_up = derived_steps(self.pending)
+        if follow_up:
+            follow_up_started = datetime.now()
+            follow_up_results = run_steps(follow_up, self.engine)
+            results.update(follow_up_results)
+            if all(r.ok for r in follow_up_results.values()):
+                clear_pending(self.engine, self.pending, follow_up_started)
+                self.pending.clear()
+            else:
+                self.derived_retry_at = datetime.now() + timedelta(seconds=FAILURE_RETRY_SECONDS)
+                print(f"⚠️ Follow-up steps failed, retrying at {self.derived_retry_at:%H:%M:%S}")
+        else:
+            print("💤 No new data, skipping sentiment and risk")
+        
+        print_summary("SCHEDULER RUN", results)
+        return results
+    
+    def seconds_until_next(self):
+        soonest = min(self.next_run.values())
+        if self.pending:
+            soonest = min(soonest, self.derived_retry_at)
+        return min(MAX_SLEEP_SECONDS, max(0.0, (soonest - datetime.now()).total_seconds()))
+    
+    def request_stop(self, signum=None, frame=None):
+        if not self.stop.is_set():
+            print("\n🛑 Shutdown requested, finishing the current run...")
+        self.stop.set()
+    
+    def run_forever(self):
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.request_stop)
+            signal.signal(signal.SIGINT, self.request_stop)
+        
+        print("🚀 BioPulse scheduler started")
+        for name, seconds in self.intervals.items():
+            print(f"   {name}: every {seconds // 60} min, next {max(self.next_run[name], datetime.now()):%H:%M:%S}")
+        
+        while not self.stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                # One bad round (e.g. the database restarting) must not kill the daemon
+                print(f"❌ Scheduler run failed: {e}")
+            self.stop.wait(self.seconds_until_next())
+        
+        print("👋 Scheduler stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run BioPulse collectors on a schedule")
+    parser.add_argument('--once', action='store_true', help="run whatever is due now, then exit")
+    args = parser.parse_args()
+    
+    scheduler = Scheduler()
+    try:
+        if args.once:
+            results = scheduler.run_due()
+            return 0 if all(r.ok for r in results.values()) else 1
+        scheduler.run_forever()
+        return 0
+    finally:
+        dispose_engine()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Full-text search over news articles
+raw_news_articles.search_vector is a tsvector over title (weight A),
+description (B) and content (C), kept current by a trigger on every write
+and indexed with GIN, so searches never scan the table. The content
+lexemes survive content being moved to content_blobs (partition_maintenance.py).
+
+Queries use web-search syntax: "quoted phrases", OR, and -excluded words,
+e.g. '"Lubbock County" measles -vaccine'.
+Run: python search.py '"Lubbock County"' [--since 2025-01-01] [--until ...] [--source Reuters] [--page 2]
+"""
+
+import argparse
+from datetime import date, timedelta
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine
+import metrics
+
+TS_CONFIG = 'english'
+PAGE_SIZE = 20
+
+# Highlight matches in the description (only computed for the returned page)
+HEADLINE_OPTIONS = 'StartSel=**, StopSel=**, MaxFragments=2, MinWords=8, MaxWords=30'
+
+def _filters(query, start_date=None, end_date=None, sources=()):
+    """WHERE clause and params shared by search() and count()"""
+    where = f"search_vector @@ websearch_to_tsquery('{TS_CONFIG}', :query)"
+    params = {'query': query}
+    if start_date is not None:
+        where += " AND published_at >= :start"
+        params['start'] = start_date
+    if end_date is not None:
+        # Whole days: end_date itself is included
+        where += " AND published_at < :end"
+        params['end'] = end_date + timedelta(days=1)
+    if sources:
+        where += " AND source_name = ANY(:sources)"
+        params['sources'] = list(sources)
+    return where, params
+
+@metrics.timed('search.count')
+def count(engine, query, start_date=None, end_date=None, sources=()):
+    """Number of articles matching query and filters"""
+    if not (query or '').strip():
+        return 0
+    where, params = _filters(query, start_date, end_date, sources)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM raw_news_articles WHERE {where}"), params).scalar()
+
+@metrics.timed('search.query')
+def search(engine, query, start_date=None, end_date=None, sources=(), page=1, page_size=PAGE_SIZE, order='rank'):
+    """
+    One page of articles matching query, best match first (order='rank',
+    ts_rank_cd with ties broken by recency) or newest first (order='date').
+    Returns a DataFrame with the article columns, rank and a highlighted snippet.
+    """
+    columns = ['published_at', 'title', 'source_name', 'query_category', 'article_url', 'rank', 'snippet']
+    if not (query or '').strip():
+        return pd.DataFrame(columns=columns)
+    where, params = _filters(query, start_date, end_date, sources)
+    params.update({'limit': page_size, 'offset': (max(page, 1) - 1) * page_size})
+    order_by = 'rank DESC, published_at DESC' if order == 'rank' else 'published_at DESC, rank DESC'
+    sql = text(f"""
+    WITH hits AS (
+        SELECT id, published_at, title, description, source_name, query_category, article_url,
+               ts_rank_cd(search_vector, websearch_to_tsquery('{TS_CONFIG}', :query)) AS rank
+        FROM raw_news_articles
+        WHERE {where}
+        ORDER BY {order_by}
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT published_at, title, source_name, query_category, article_url, rank,
+           ts_headline('{TS_CONFIG}', COALESCE(description, ''), websearch_to_tsquery('{TS_CONFIG}', :query),
+                       '{HEADLINE_OPTIONS}') AS snippet
+    FROM hits
+    ORDER BY {order_by}
+    """)
+    df = pd.read_sql(sql, engine, params=params)
+    metrics.add_rows(fetched=len(df))
+    df['published_at'] = pd.to_datetime(df['published_at'])
+    return df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Search stored news articles")
+    parser.add_argument('query', help='web-search syntax, e.g. \'"Lubbock County" measles\'')
+    parser.add_argument('--since', type=date.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument('--until', type=date.fromisoformat, help="last day (YYYY-MM-DD)")
+    parser.add_argument('--source', action='append', default=[], help="limit to a source (repeatable)")
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--newest', action='store_true', help="newest first instead of best match")
+    args = parser.parse_args()
+    
+    engine = get_engine()
+    total = count(engine, args.query, args.since, args.until, args.source)
+    print(f"🔎 {total:,} articles match {args.query!r}")
+    results = search(engine, args.query, args.since, args.until, args.source, page=args.page,
+                     order='date' if args.newest else 'rank')
+    for _, row in results.iterrows():
+        day = row['published_at'].strftime('%Y-%m-%d') if pd.notna(row['published_at']) else '----------'
+        print(f"\n{day}  {row['source_name']}  (rank {row['rank']:.3f})")
+        print(f"   {row['title']}")
+        if row['snippet']:
+            print(f"   {row['snippet']}")
+        print(f"   {row['article_url']}")
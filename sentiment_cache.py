@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Sentiment Cache
+Memoizes sentiment scores by a hash of the normalized article text, so
+syndicated copies of the same story are only scored once.
+
+Keys are per scoring model (see text_key), so switching SENTIMENT_MODEL
+never returns another model's scores.
+Lookups go to an in-process LRU first, then (when an engine is given) to the
+persistent `sentiment_cache` table in PostgreSQL.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text, bindparam
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Part of every key; bump when normalize_text changes so entries stored
+# under the old normalization are never read (they age out via pruning).
+# 2: case is kept (TextBlob scores ':D' and ':d' differently)
+KEY_VERSION = 2
+
+# Keys per SELECT ... IN (...) round trip
+LOOKUP_BATCH_SIZE = 1000
+
+SELECT_SQL = text("""
+SELECT text_hash, sentiment_score, subjectivity_score, sentiment_label
+FROM sentiment_cache
+WHERE text_hash IN :keys
+""").bindparams(bindparam('keys', expanding=True))
+
+TOUCH_SQL = text("""
+UPDATE sentiment_cache SET last_used_at = :now
+WHERE text_hash IN :keys
+""").bindparams(bindparam('keys', expanding=True))
+
+UPSERT_SQL = text("""
+INSERT INTO sentiment_cache (text_hash, sentiment_score, subjectivity_score, sentiment_label, last_used_at)
+VALUES (:text_hash, :sentiment_score, :subjectivity_score, :sentiment_label, :last_used_at)
+ON CONFLICT (text_hash) DO UPDATE SET
+    sentiment_score = EXCLUDED.sentiment_score,
+    subjectivity_score = EXCLUDED.subjectivity_score,
+    sentiment_label = EXCLUDED.sentiment_label,
+    last_used_at = EXCLUDED.last_used_at
+""")
+
+# Keep the newest max_entries rows, drop the rest
+PRUNE_SQL = text("""
+DELETE FROM sentiment_cache
+WHERE text_hash IN (
+    SELECT text_hash FROM sentiment_cache
+    ORDER BY last_used_at DESC
+    OFFSET :max_entries
+)
+""")
+
+def normalize_text(text):
+    """
+    Collapse whitespace. Case is kept: scores can depend on it (TextBlob
+    rates the emoticon ':D' 1.0 and ':d' 0.0).
+    """
+    if text is None or pd.isna(text):
+        return ''
+    return _WHITESPACE.sub(' ', str(text)).strip()
+
+def text_key(text, namespace=None):
+    """
+    Cache key: sha1 of the normalized text, prefixed with KEY_VERSION and
+    `namespace` (the scoring model and version) so each model gets its own entries
+    """
+    normalized = normalize_text(text)
+    if namespace:
+        normalized = f"{namespace}\x00{normalized}"
+    normalized = f"v{KEY_VERSION}\x00{normalized}"
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """
+    Two-level sentiment cache.
+    - memory: bounded LRU (max_memory_entries), evicts least recently used
+    - store: optional `sentiment_cache` table, pruned to max_store_entries
+    Values are (polarity, subjectivity, label) tuples.
+    """
+    
+    def __init__(self, engine=None, max_memory_entries=50000, max_store_entries=1000000):
+        self.engine = engine
+        self.max_memory_entries = max_memory_entries
+        self.max_store_entries = max_store_entries
+        self._memory = OrderedDict()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+    
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def get_many(self, keys):
+        """Return {key: value} for every key found in memory or the store"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                found[key] = self._memory[key]
+                self.memory_hits += 1
+            else:
+                missing.append(key)
+        
+        rows = []
+        if missing and self.engine is not None:
+            now = datetime.now()
+            with self.engine.begin() as conn:
+                for i in range(0, len(missing), LOOKUP_BATCH_SIZE):
+                    batch = conn.execute(SELECT_SQL, {'keys': missing[i:i + LOOKUP_BATCH_SIZE]}).fetchall()
+                    if batch:
+                        conn.execute(TOUCH_SQL, {'keys': [r[0] for r in batch], 'now': now})
+                    rows.extend(batch)
+            for key, polarity, subjectivity, label in rows:
+                value = (polarity, subjectivity, label)
+                self._remember(key, value)
+                found[key] = value
+            self.store_hits += len(rows)
+        
+        self.misses += len(missing) - len(rows)
+        return found
+    
+    def get(self, key):
+        return self.get_many([key]).get(key)
+    
+    def put_many(self, values):
+        """Store {key: (polarity, subjectivity, label)} in memory and the store"""
+        if not values:
+            return
+        for key, value in values.items():
+            self._remember(key, value)
+        
+        if self.engine is not None:
+            now = datetime.now()
+            records = [{
+                'text_hash': key,
+                'sentiment_score': float(v[0]),
+                'subjectivity_score': float(v[1]),
+                'sentiment_label': v[2],
+                'last_used_at': now
+            } for key, v in values.items()]
+            with self.engine.begin() as conn:
+                conn.execute(UPSERT_SQL, records)
+    
+    def put(self, key, value):
+        self.put_many({key: value})
+    
+    def prune(self):
+        """Evict the least recently used rows beyond max_store_entries"""
+        if self.engine is None:
+            return 0
+        with self.engine.begin() as conn:
+            result = conn.execute(PRUNE_SQL, {'max_entries': self.max_store_entries})
+        return result.rowcount
+    
+    def stats(self):
+        """Hit/miss counters since this cache was created"""
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            'lookups': lookups,
+            'memory_hits': self.memory_hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.store_hits) / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory)
+        }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Sentiment scorers
+Every scorer has a name, a version and score_batch(texts), which returns
+(polarity, subjectivity, labels) arrays aligned with texts. sentiment_analysis
+picks one by name (SENTIMENT_MODEL, default 'textblob') and records the name
+and version with every score, so models can be compared on the same articles.
+
+- textblob: TextBlob's pattern analyzer, one text at a time (slow, general)
+- lexicon:  vectorized scorer over a compact health-news lexicon
+"""
+
+import hashlib
+import os
+import re
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+ACTIVE_MODEL = os.getenv('SENTIMENT_MODEL', 'textblob')
+
+# Polarity beyond +/- this is positive / negative
+LABEL_THRESHOLD = 0.1
+
+def labels_for(polarity):
+    """positive / negative / neutral for an array of polarities"""
+    polarity = np.asarray(polarity, dtype=float)
+    return np.select([polarity > LABEL_THRESHOLD, polarity < -LABEL_THRESHOLD],
+                     ['positive', 'negative'], default='neutral').astype(object)
+
+class TextBlobScorer:
+    name = 'textblob'
+    parallel = True   # slow per text, worth a process pool
+    
+    def __init__(self):
+        import textblob
+        self._textblob = textblob
+        self.version = metadata.version('textblob')
+    
+    def _score(self, text):
+        if not text or pd.isna(text):
+            return 0.0, 0.0
+        try:
+            sentiment = self._textblob.TextBlob(str(text)).sentiment
+            return sentiment.polarity, sentiment.subjectivity
+        except Exception:
+            return 0.0, 0.0
+    
+    def score_batch(self, texts):
+        scores = np.array([self._score(t) for t in texts], dtype=float).reshape(-1, 2)
+        return scores[:, 0], scores[:, 1], labels_for(scores[:, 0])
+
+# Word valences in [-1, 1], tuned for outbreak coverage: "positive" is left
+# out on purpose ("tested positive" is bad news), and case/spread words lean
+# negative where a general-purpose lexicon would call them neutral.
+LEXICON = {
+    # spread and severity
+    'outbreak': -0.5, 'outbreaks': -0.5, 'epidemic': -0.6, 'pandemic': -0.6,
+    'spread': -0.4, 'spreads': -0.4, 'spreading': -0.4, 'surge': -0.5, 'surges': -0.5,
+    'surging': -0.5, 'spike': -0.4, 'rising': -0.3, 'resurgence': -0.6, 'cluster': -0.3,
+    'infected': -0.5, 'infection': -0.4, 'infections': -0.4, 'contagious': -0.4,
+    'exposure': -0.3, 'exposed': -0.3, 'exposures': -0.3, 'unvaccinated': -0.4,
+    'hospitalized': -0.6, 'hospitalization': -0.5, 'hospitalizations': -0.5,
+    'complications': -0.5, 'sick': -0.5, 'ill': -0.4, 'illness': -0.4,
+    'death': -0.8, 'deaths': -0.8, 'died': -0.8, 'dies': -0.8, 'dead': -0.8,
+    'deadly': -0.8, 'fatal': -0.8, 'killed': -0.8,
+    # alarm and risk
+    'emergency': -0.5, 'crisis': -0.7, 'alarming': -0.6, 'alarm': -0.5, 'threat': -0.5,
+    'concern': -0.3, 'concerns': -0.3, 'concerning': -0.4, 'worried': -0.5, 'worry': -0.4,
+    'fear': -0.5, 'fears': -0.5, 'warning': -0.4, 'warns': -0.4, 'warn': -0.4,
+    'risk': -0.3, 'risks': -0.3, 'dangerous': -0.7, 'danger': -0.6, 'serious': -0.4,
+    'severe': -0.6, 'worst': -0.8, 'worse': -0.6, 'bad': -0.6, 'terrible': -0.8,
+    'quarantine': -0.3, 'misinformation': -0.5, 'hesitancy': -0.4, 'refuse': -0.3,
+    'declining': -0.3, 'failed': -0.5, 'failure': -0.5,
+    # protection and recovery
+    'vaccinated': 0.3, 'vaccination': 0.2, 'vaccinations': 0.2, 'immunization': 0.2,
+    'immunity': 0.3, 'immune': 0.3, 'protect': 0.5, 'protected': 0.5, 'protects': 0.5,
+    'protection': 0.4, 'prevent': 0.4, 'prevented': 0.5, 'prevention': 0.3,
+    'contained': 0.5, 'containment': 0.3, 'recovered': 0.6, 'recovery': 0.5,
+    'recovering': 0.4, 'safe': 0.5, 'safety': 0.3, 'effective': 0.6, 'success': 0.7,
+    'successful': 0.7, 'eliminated': 0.7, 'improve': 0.5, 'improved': 0.5,
+    'improving': 0.4, 'good': 0.5, 'great': 0.7, 'strong': 0.4, 'healthy': 0.5,
+    'relief': 0.5, 'reassuring': 0.5, 'encouraging': 0.5, 'boost': 0.4, 'ended': 0.3,
+}
+NEGATORS = {'not', 'no', 'never', 'without', 'nor', 'none'}
+INTENSIFIERS = {'very': 1.5, 'extremely': 1.8, 'highly': 1.5, 'rapidly': 1.5,
+                'most': 1.5, 'record': 1.3, 'dramatically': 1.6}
+NEGATION_FACTOR = -0.75
+NORMALIZE_ALPHA = 1.0   # polarity = sum / sqrt(sum^2 + alpha), as in VADER
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+class LexiconScorer:
+    """
+    Scores a whole batch with a handful of NumPy operations: every token of
+    every text is mapped to an index into precompiled weight arrays, negation
+    and intensifiers are applied from the preceding token, and bincount sums
+    the weights per text. Subjectivity is the share of words that carry
+    sentiment.
+    """
+    name = 'lexicon'
+    parallel = False
+    
+    def __init__(self, lexicon=None):
+        lexicon = lexicon or LEXICON
+        words = sorted(set(lexicon) | NEGATORS | set(INTENSIFIERS))
+        # Index 0 is every word outside the lexicon
+        self.index = {word: i + 1 for i, word in enumerate(words)}
+        self.valence = np.array([0.0] + [lexicon.get(w, 0.0) for w in words])
+        self.negator = np.array([False] + [w in NEGATORS for w in words])
+        self.boost = np.array([1.0] + [INTENSIFIERS.get(w, 1.0) for w in words])
+        self.version = hashlib.sha1(repr(sorted(lexicon.items())).encode()).hexdigest()[:12]
+    
+    def _token_ids(self, texts):
+        """Flat token index array plus the text each token belongs to"""
+        ids, owners = [], []
+        for i, text in enumerate(texts):
+            if not text or pd.isna(text):
+                continue
+            tokens = TOKEN_PATTERN.findall(str(text).lower())
+            ids.extend(self.index.get(t, -1 if t.endswith("n't") else 0) for t in tokens)
+            owners.extend([i] * len(tokens))
+        return np.array(ids, dtype=np.int64), np.array(owners, dtype=np.int64)
+    
+    def score_batch(self, texts):
+        texts = list(texts)
+        n = len(texts)
+        ids, owners = self._token_ids(texts)
+        if not len(ids):
+            zeros = np.zeros(n)
+            return zeros, zeros.copy(), labels_for(zeros)
+        
+        # -1 marks contractions like "isn't": a negator outside the table
+        negator = np.where(ids < 0, True, self.negator[np.maximum(ids, 0)])
+        ids = np.maximum(ids, 0)
+        weights = self.valence[ids]
+        
+        # Look one token back, never across texts
+        same_text = np.r_[False, owners[1:] == owners[:-1]]
+        prev_ids = np.r_[0, ids[:-1]]
+        prev_negator = np.r_[False, negator[:-1]] & same_text
+        prev_boost = np.where(same_text, self.boost[prev_ids], 1.0)
+        weights = weights * prev_boost * np.where(prev_negator, NEGATION_FACTOR, 1.0)
+        
+        total = np.bincount(owners, weights=weights, minlength=n)
+        hits = np.bincount(owners, weights=(self.valence[ids] != 0), minlength=n)
+        counts = np.bincount(owners, minlength=n)
+        
+        polarity = np.clip(total / np.sqrt(total ** 2 + NORMALIZE_ALPHA), -1.0, 1.0)
+        subjectivity = np.divide(hits, counts, out=np.zeros(n), where=counts > 0)
+        return polarity, subjectivity, labels_for(polarity)
+
+MODELS = {
+    'textblob': TextBlobScorer,
+    'lexicon': LexiconScorer,
+}
+
+_scorers = {}
+
+def get_scorer(name=None):
+    """The (shared) scorer called `name`, default SENTIMENT_MODEL"""
+    name = name or ACTIVE_MODEL
+    if name not in MODELS:
+        raise ValueError(f"Unknown sentiment model '{name}' (choose from {', '.join(MODELS)})")
+    if name not in _scorers:
+        _scorers[name] = MODELS[name]()
+    return _scorers[name]
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate story clustering
+Syndicated copies of one story (the same AP/Reuters piece on dozens of
+outlets) get the same raw_news_articles.story_cluster_id, so sentiment can
+be scored once per story and aggregates can count stories instead of copies.
+
+Each article gets a MinHash signature over word shingles of its title and
+description. Signatures are split into LSH bands; story_lsh_buckets maps
+every (band, bucket) seen so far to a story, so finding candidate stories
+for a new article is NUM_BANDS primary-key lookups however many articles
+are stored. A candidate is accepted when the estimated Jaccard similarity
+to the story's first article reaches SIMILARITY_THRESHOLD; otherwise the
+article starts a new story whose id is the article's own id.
+Run: python story_clusters.py     # cluster every article that has no story yet
+"""
+
+import re
+import zlib
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from db import get_engine, read_sql_chunks
+import metrics
+
+NUM_PERM = 64
+NUM_BANDS = 16              # 16 bands x 4 rows: ~50% similar copies usually collide
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SHINGLE_WORDS = 3
+SIMILARITY_THRESHOLD = 0.5
+CHUNK_SIZE = 5000
+
+# Universal hashing (a * x + b) mod P, fixed seed so signatures are stable
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20250101)
+_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_BAND_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+                      0x165667B19E3779F9, 0x27D4EB2F165667C5], dtype=np.uint64)[:ROWS_PER_BAND]
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+ClusterResult = namedtuple('ClusterResult', ['articles', 'new_stories'])
+
+UNASSIGNED_SQL = """
+SELECT id, title, description
+FROM raw_news_articles
+WHERE story_cluster_id IS NULL
+"""
+
+LOOKUP_SQL = text("""
+SELECT b.band, b.bucket, b.cluster_id
+FROM story_lsh_buckets b
+JOIN unnest(CAST(:bands AS smallint[]), CAST(:buckets AS bigint[])) AS k(band, bucket)
+  ON b.band = k.band AND b.bucket = k.bucket
+""")
+
+SIGNATURES_SQL = text("SELECT cluster_id, signature FROM story_clusters WHERE cluster_id = ANY(:ids)")
+
+INSERT_CLUSTERS_SQL = text("""
+INSERT INTO story_clusters (cluster_id, signature)
+SELECT * FROM unnest(CAST(:ids AS integer[]), CAST(:signatures AS bytea[]))
+ON CONFLICT (cluster_id) DO NOTHING
+""")
+
+INSERT_BUCKETS_SQL = text("""
+INSERT INTO story_lsh_buckets (band, bucket, cluster_id)
+SELECT * FROM unnest(CAST(:bands AS smallint[]), CAST(:buckets AS bigint[]), CAST(:ids AS integer[]))
+ON CONFLICT (band, bucket) DO NOTHING
+""")
+
+ASSIGN_SQL = text("""
+UPDATE raw_news_articles n
+SET story_cluster_id = a.cluster_id
+FROM unnest(CAST(:ids AS integer[]), CAST(:cluster_ids AS integer[])) AS a(id, cluster_id)
+WHERE n.id = a.id
+""")
+
+# Articles in a chunk that are the first copy of a story: they were edited
+# (ingest clears the story of an edited article) and must give the story up
+ROOTS_SQL = text("SELECT cluster_id FROM story_clusters WHERE cluster_id = ANY(:ids)")
+
+NEXT_ROOT_SQL = text("""
+SELECT MIN(id) FROM raw_news_articles
+WHERE story_cluster_id = :old
+""")
+
+REROOT_SQL = [
+    text("UPDATE raw_news_articles SET story_cluster_id = :new WHERE story_cluster_id = :old"),
+    text("""INSERT INTO story_clusters (cluster_id, signature, created_at)
+            SELECT :new, signature, created_at FROM story_clusters WHERE cluster_id = :old"""),
+    text("UPDATE story_lsh_buckets SET cluster_id = :new WHERE cluster_id = :old"),
+]
+
+def _release_roots(conn, ids):
+    """
+    Hand each edited story root's story to its next copy (or drop the story
+    if it has none), so the edited text is matched from scratch and its id
+    is free to start a new story
+    """
+    for (old,) in conn.execute(ROOTS_SQL, {'ids': ids}).fetchall():
+        new = conn.execute(NEXT_ROOT_SQL, {'old': old}).scalar()
+        if new is not None:
+            for statement in REROOT_SQL:
+                conn.execute(statement, {'old': old, 'new': new})
+        else:
+            conn.execute(text("DELETE FROM story_lsh_buckets WHERE cluster_id = :old"), {'old': old})
+        conn.execute(text("DELETE FROM story_clusters WHERE cluster_id = :old"), {'old': old})
+
+def shingles(text):
+    """crc32 of every SHINGLE_WORDS-word window (the words themselves for short texts)"""
+    words = _WORD.findall((text or '').lower())
+    if len(words) < SHINGLE_WORDS:
+        grams = words
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return np.array(sorted({zlib.crc32(g.encode('utf-8')) for g in grams}), dtype=np.uint64)
+
+def signature(text):
+    """MinHash signature (NUM_PERM uint32 values); all-max for empty text"""
+    values = shingles(text) % _PRIME
+    if not len(values):
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    hashed = (values[:, None] * _A[None, :] + _B[None, :]) % _PRIME
+    return hashed.min(axis=0).astype(np.uint32)
+
+def band_buckets(signatures):
+    """(n, NUM_BANDS) int64 bucket ids, one per band of each signature"""
+    bands = signatures.astype(np.uint64).reshape(len(signatures), NUM_BANDS, ROWS_PER_BAND)
+    # uint64 arithmetic wraps, which is all a hash needs
+    return (bands * _BAND_MIX).sum(axis=2, dtype=np.uint64).view(np.int64)
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+def _article_text(title, description):
+    return ' '.join(t for t in (title, description) if pd.notna(t))
+
+def _assign_chunk(conn, df):
+    """Cluster one chunk of unassigned articles; returns the number of new stories"""
+    ids = df['id'].astype(int).tolist()
+    _release_roots(conn, ids)
+    signatures = np.array([signature(_article_text(t, d)) for t, d in zip(df['title'], df['description'])],
+                          dtype=np.uint32).reshape(len(ids), NUM_PERM)
+    buckets = band_buckets(signatures)
+    bands = np.tile(np.arange(NUM_BANDS), len(ids))
+    
+    index = {(band, bucket): cluster_id for band, bucket, cluster_id in conn.execute(
+        LOOKUP_SQL, {'bands': bands.tolist(), 'buckets': buckets.ravel().tolist()})}
+    known = {cluster_id: np.frombuffer(bytes(sig), dtype=np.uint32) for cluster_id, sig in conn.execute(
+        SIGNATURES_SQL, {'ids': sorted(set(index.values()))})}
+    
+    assigned, new_buckets, new_clusters = [], {}, []
+    for article_id, sig, row in zip(ids, signatures, buckets):
+        keys = [(band, int(bucket)) for band, bucket in enumerate(row)]
+        candidates = {index.get(k, new_buckets.get(k)) for k in keys} - {None}
+        scored = [(similarity(sig, known[c]), c) for c in candidates if c in known]
+        best = max(scored, default=(0.0, None))
+        if best[0] >= SIMILARITY_THRESHOLD:
+            cluster_id = best[1]
+        else:
+            cluster_id = article_id
+            known[cluster_id] = sig
+            new_clusters.append(cluster_id)
+        assigned.append(cluster_id)
+        # Every copy adds its buckets, so later variants can match any of them
+        for k in keys:
+            if k not in index and k not in new_buckets:
+                new_buckets[k] = cluster_id
+    
+    if new_clusters:
+        conn.execute(INSERT_CLUSTERS_SQL, {'ids': new_clusters,
+                                           'signatures': [known[c].tobytes() for c in new_clusters]})
+    if new_buckets:
+        conn.execute(INSERT_BUCKETS_SQL, {'bands': [k[0] for k in new_buckets],
+                                          'buckets': [k[1] for k in new_buckets],
+                                          'ids': list(new_buckets.values())})
+    conn.execute(ASSIGN_SQL, {'ids': ids, 'cluster_ids': assigned})
+    return len(new_clusters)
+
+@metrics.timed('clusters')
+def assign_clusters(engine=None, urls=None):
+    """
+    Give every article without a story (optionally only those at `urls`)
+    a story_cluster_id. Returns ClusterResult(articles, new_stories).
+    """
+    engine = engine or get_engine()
+    query = UNASSIGNED_SQL
+    params = None
+    if urls is not None:
+        query += "  AND article_url = ANY(:urls)\n"
+        params = {'urls': list(urls)}
+    query += "ORDER BY id"
+    
+    articles = new_stories = 0
+    for df in read_sql_chunks(text(query), engine, params=params, chunksize=CHUNK_SIZE):
+        if df.empty:
+            continue
+        # One transaction per chunk: its lookups see the previous chunk's buckets
+        with engine.begin() as conn:
+            new_stories += _assign_chunk(conn, df)
+        articles += len(df)
+        metrics.add_rows(fetched=len(df), written=len(df))
+    return ClusterResult(articles, new_stories)
+
+if __name__ == '__main__':
+    print("🧩 Clustering articles into stories...")
+    result = assign_clusters()
+    print(f"✅ {result.articles} articles clustered: {result.new_stories} new stories, "
+          f"{result.articles - result.new_stories} copies of existing ones")
@@ -0,0 +1,83 @@
+"""
+cdc_parser against saved pages in fixtures/.
+To check a newly saved CDC page, drop it into fixtures/ and add its expected
+national total and state rows to PAGES.
+"""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from cdc_parser import parse_cdc_page
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'fixtures'
+URL = 'https://www.cdc.gov/measles/data-research/index.html'
+DAY = date(2025, 4, 2)
+
+# file: (national total, {state: cases} expected among the rows, number of non-national rows)
+PAGES = {
+    # Current layout: per-jurisdiction table with a Total row
+    'cdc_measles_sample.html': (650, {'OR': 106, 'AZ': 81, 'MD': 12, 'New York City': 37}, 15),
+    # Older layout: national count in a sentence, jurisdictions only listed by name
+    'cdc_measles_2024_text.html': (97, {}, 0),
+}
+
+def parse(name):
+    return parse_cdc_page((FIXTURES / name).read_text(encoding='utf-8'), URL, report_date=DAY)
+
+@pytest.mark.parametrize('name', sorted(PAGES))
+def test_national_total(name):
+    df = parse(name)
+    national, _, _ = PAGES[name]
+    assert df.iloc[0]['state'] == 'US'
+    assert df.iloc[0]['case_count'] == national
+    assert (df['report_date'] == DAY).all()
+    assert (df['source_url'] == URL).all()
+    assert df['county'].isna().all()
+
+@pytest.mark.parametrize('name', sorted(PAGES))
+def test_state_rows(name):
+    df = parse(name)
+    _, expected, count = PAGES[name]
+    rows = dict(zip(df['state'][1:], df['case_count'][1:]))
+    assert len(rows) == count
+    for state, cases in expected.items():
+        assert rows[state] == cases
+
+def test_non_state_jurisdiction_keeps_its_name():
+    states = set(parse('cdc_measles_sample.html')['state'])
+    assert 'New York City' in states
+    assert 'NY' in states
+
+def test_total_row_and_other_tables_are_not_states():
+    states = set(parse('cdc_measles_sample.html')['state'])
+    assert not {'Total', 'Under 5 years'} & states
+
+def test_counts_outside_main_are_ignored():
+    # Header and footer mention "800 cases" / "2000 cases"
+    assert parse('cdc_measles_no_data.html').empty
+
+def test_no_table_and_no_case_phrase():
+    html = '<html><main><h1>Measles</h1><p>Data will be updated on Wednesday.</p></main></html>'
+    assert parse_cdc_page(html, URL).empty
+
+def test_national_is_sum_of_states_without_total_row():
+    html = """<main><table>
+      <tr><th>State</th><th>Cases</th></tr>
+      <tr><td>Texas</td><td>1,001</td></tr>
+      <tr><td>New Mexico</td><td>81</td></tr>
+    </table></main>"""
+    df = parse_cdc_page(html, URL)
+    assert df.iloc[0]['case_count'] == 1082
+    assert dict(zip(df['state'][1:], df['case_count'][1:])) == {'NM': 81, 'TX': 1001}
+
+@pytest.mark.parametrize('sentence, cases', [
+    ('As of July 1, 2025, a total of 1,267 confirmed measles cases were reported', 1267),
+    ('From January 1 to December 31, 2019, 1,282 individual cases of measles were confirmed', 1282),
+    ('a total of 97 measles cases were reported by 19 jurisdictions', 97),
+])
+def test_case_phrases(sentence, cases):
+    df = parse_cdc_page(f'<main><p>{sentence}</p></main>', URL)
+    assert df.iloc[0]['case_count'] == cases
+    assert len(df) == 1
@@ -0,0 +1,61 @@
+"""renormalize() putting keyword groups of one geo on a common scale, and fetch_group()'s client reuse"""
+
+import threading
+
+import pandas as pd
+
+import run_google_trends
+from run_google_trends import ANCHOR_KEYWORD, renormalize
+
+DATES = pd.date_range('2025-03-01', periods=3, name='date')
+
+def frame(**columns):
+    return pd.DataFrame(columns, index=DATES)
+
+def test_groups_scaled_to_first_anchor():
+    first = frame(**{ANCHOR_KEYWORD: [10, 20, 30], 'mmr vaccine': [1, 2, 3]})
+    second = frame(**{ANCHOR_KEYWORD: [5, 10, 15], 'measles symptoms': [4, 4, 4]})
+    scaled = renormalize([(1, first), (2, second)])
+    assert [group for group, _ in scaled] == [1, 2]
+    assert list(scaled[1][1].columns) == ['measles symptoms']
+    assert scaled[1][1]['measles symptoms'].tolist() == [8.0, 8.0, 8.0]
+
+def test_unscalable_groups_are_dropped():
+    first = frame(**{ANCHOR_KEYWORD: [10, 20, 30], 'mmr vaccine': [1, 2, 3]})
+    frames = [
+        (1, first),
+        (2, pd.DataFrame()),                                             # nothing returned
+        (3, frame(**{'measles rash': [1, 1, 1]})),                        # anchor missing
+        (4, frame(**{ANCHOR_KEYWORD: [0, 0, 0], 'measles cases': [1, 1, 1]})),
+    ]
+    assert [group for group, _ in renormalize(frames)] == [1]
+
+class CountingLimiter:
+    def __init__(self):
+        self.waits = 0
+    
+    def wait(self):
+        self.waits += 1
+
+def test_one_rate_limited_client_per_thread(monkeypatch):
+    created = []
+    
+    class FakeTrendReq:
+        def __init__(self, **kwargs):
+            created.append(threading.get_ident())
+        
+        def build_payload(self, keywords, **kwargs):
+            pass
+        
+        def interest_over_time(self):
+            return frame(**{ANCHOR_KEYWORD: [1, 2, 3]})
+    
+    monkeypatch.setattr(run_google_trends, 'TrendReq', FakeTrendReq)
+    limiter = CountingLimiter()
+    thread = threading.Thread(target=lambda: [
+        run_google_trends.fetch_group(limiter, 'US', [ANCHOR_KEYWORD], 'today 3-m') for _ in range(3)])
+    thread.start()
+    thread.join()
+    assert len(created) == 1
+    # The cookie request when the client is built, then one per fetch
+    assert limiter.waits == 4
@@ -0,0 +1,158 @@
+"""
+run_newsapi_scraper against a local mock of NewsAPI's /everything endpoint
+(aiohttp TestServer, NEWSAPI_BASE_URL pointed at it). No key or network needed.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import run_newsapi_scraper as newsapi
+
+QUERY = 'measles outbreak'
+
+class MockNewsAPI:
+    """
+    Serves `articles` (newest first) filtered by `from` and paged by
+    page/pageSize like NewsAPI. Queued `failures` (status, code) are
+    answered first, one per request; `failing_pages` always fail. A code
+    of None answers with a gateway-style HTML body instead of JSON.
+    """
+    
+    def __init__(self, count=25):
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        self.articles = [{
+            'url': f'https://news.example/{i}',
+            'source': {'name': 'Example'},
+            'title': f'Story {i}',
+            'publishedAt': (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        } for i in range(count)]
+        self.failures = []
+        self.failing_pages = {}
+        self.requests = []
+    
+    async def everything(self, request):
+        query = request.query
+        self.requests.append({'page': int(query['page']), 'from': query['from'],
+                              'key': request.headers.get('X-Api-Key')})
+        failure = self.failures.pop(0) if self.failures else self.failing_pages.get(int(query['page']))
+        if failure:
+            status, code = failure
+            if code is None:
+                return web.Response(text='<html><body>502 Bad Gateway</body></html>',
+                                    content_type='text/html', status=status)
+            return web.json_response({'status': 'error', 'code': code, 'message': code}, status=status)
+        since = query['from'] + 'Z'
+        matching = [a for a in self.articles if a['publishedAt'] >= since]
+        page, size = int(query['page']), int(query['pageSize'])
+        return web.json_response({'status': 'ok', 'totalResults': len(matching),
+                                  'articles': matching[(page - 1) * size:page * size]})
+    
+    def pages(self):
+        return sorted(r['page'] for r in self.requests)
+
+@pytest.fixture
+def api(monkeypatch):
+    """A running MockNewsAPI on its own event loop thread"""
+    mock = MockNewsAPI()
+    app = web.Application()
+    app.router.add_get('/v2/everything', mock.everything)
+    loop = asyncio.new_event_loop()
+    server = TestServer(app)
+    ready = threading.Event()
+    
+    def serve():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start_server())
+        ready.set()
+        loop.run_forever()
+    
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait(10)
+    
+    monkeypatch.setattr(newsapi, 'NEWSAPI_BASE_URL', str(server.make_url('/v2')))
+    monkeypatch.setattr(newsapi, 'QUERIES', [QUERY])
+    monkeypatch.setattr(newsapi, 'PAGE_SIZE', 10)
+    monkeypatch.setattr(newsapi, 'REQUESTS_PER_SECOND', 1000)
+    monkeypatch.setattr(newsapi, 'RETRY_BASE_DELAY', 0.01)
+    yield mock
+    
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+def fetch_one(page=1):
+    """fetch_page for one page of QUERY with its own session"""
+    async def run():
+        limiter = newsapi.RateLimiter(newsapi.REQUESTS_PER_SECOND)
+        async with aiohttp.ClientSession() as session:
+            return await newsapi.fetch_page(session, limiter, asyncio.Semaphore(1), 'test-key',
+                                            QUERY, page, '2000-01-01T00:00:00')
+    return asyncio.run(run())
+
+def test_fetches_every_page(api):
+    rows = list(newsapi.iter_news_articles('test-key', {}))
+    assert api.pages() == [1, 2, 3]
+    assert {r['article_url'] for r in rows} == {a['url'] for a in api.articles}
+    assert all(r['query_category'] == QUERY for r in rows)
+    assert {r['key'] for r in api.requests} == {'test-key'}
+
+def test_pages_capped_at_max_pages(api, monkeypatch):
+    monkeypatch.setattr(newsapi, 'MAX_PAGES', 2)
+    rows = list(newsapi.iter_news_articles('test-key', {}))
+    assert api.pages() == [1, 2]
+    assert len(rows) == 20
+
+def test_stops_at_watermark(api):
+    # Articles 0-4 are newer than the stored one (article 5)
+    stored = datetime.strptime(api.articles[5]['publishedAt'], '%Y-%m-%dT%H:%M:%SZ')
+    rows = list(newsapi.iter_news_articles('test-key', {QUERY: stored}))
+    assert api.pages() == [1]
+    assert api.requests[0]['from'] == stored.strftime('%Y-%m-%dT%H:%M:%S')
+    # `from` is inclusive; the stored boundary article is dropped
+    assert [r['article_url'] for r in rows] == [a['url'] for a in api.articles[:5]]
+
+def test_retries_after_429(api):
+    api.failures = [(429, 'rateLimited'), (503, 'unexpectedError')]
+    payload = fetch_one()
+    assert payload['status'] == 'ok'
+    assert len(api.requests) == 3
+
+def test_retries_gateway_errors_without_json(api):
+    api.failures = [(502, None), (503, None)]
+    payload = fetch_one()
+    assert payload['status'] == 'ok'
+    assert len(api.requests) == 3
+
+def test_gateway_error_after_max_retries(api):
+    api.failures = [(502, None)] * (newsapi.MAX_RETRIES + 1)
+    with pytest.raises(RuntimeError, match='502'):
+        fetch_one()
+    assert len(api.requests) == newsapi.MAX_RETRIES + 1
+
+def test_gives_up_after_max_retries(api):
+    api.failures = [(429, 'rateLimited')] * (newsapi.MAX_RETRIES + 1)
+    with pytest.raises(RuntimeError, match='429 rateLimited'):
+        fetch_one()
+    assert len(api.requests) == newsapi.MAX_RETRIES + 1
+
+@pytest.mark.parametrize('status, code', [(401, 'apiKeyInvalid'), (426, 'maximumResultsReached')])
+def test_client_errors_are_not_retried(api, status, code):
+    api.failures = [(status, code)]
+    with pytest.raises(RuntimeError, match=f'{status} {code}'):
+        fetch_one()
+    assert len(api.requests) == 1
+
+def test_failed_later_page_keeps_other_pages(api):
+    # One of the concurrent later pages hits the plan's result cap
+    api.failing_pages = {3: (426, 'maximumResultsReached')}
+    rows = list(newsapi.iter_news_articles('test-key', {}))
+    assert api.pages() == [1, 2, 3]
+    assert len(rows) == 20
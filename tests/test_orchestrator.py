@@ -0,0 +1,72 @@
+"""run_steps ordering, skipping and retries with stub step functions"""
+
+import threading
+import time
+
+import orchestrator
+from orchestrator import Step, run_steps
+
+ENGINE = object()   # steps never touch it
+
+def ok(engine=None):
+    return 'done'
+
+def fails(engine=None):
+    raise RuntimeError('source unavailable')
+
+def test_failed_collector_does_not_skip_later_steps():
+    steps = orchestrator.pipeline_steps()
+    for step in steps:
+        step.func = fails if step.name == 'Google Trends' else ok
+        step.retries = 0
+    results = run_steps(steps, ENGINE)
+    assert results['Google Trends'].status == 'failed'
+    for name in ('Sentiment Analysis', 'Risk Scoring', 'Archive', 'Partition Maintenance'):
+        assert results[name].ok, name
+
+def test_after_waits_for_the_step_to_finish():
+    order = []
+    
+    def record(name):
+        def func(engine=None):
+            order.append(name)
+        return func
+    
+    results = run_steps([
+        Step('collect', fails),
+        Step('score', record('score'), after=['collect']),
+        Step('report', record('report'), after=['score']),
+    ], ENGINE)
+    assert order == ['score', 'report']
+    assert [r.status for r in results.values()] == ['failed', 'success', 'success']
+
+def test_depends_on_skips_when_the_dependency_fails():
+    results = run_steps([Step('collect', fails), Step('score', ok, depends_on=['collect'])], ENGINE)
+    assert results['score'].status == 'skipped'
+
+def test_failures_are_retried():
+    attempts = []
+    
+    def flaky(engine=None):
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise RuntimeError('try again')
+        return 'done'
+    
+    result = run_steps([Step('flaky', flaky, retries=1, retry_delay=0)], ENGINE)['flaky']
+    assert result.ok and result.attempts == 2
+
+def test_timeout_is_not_retried_and_attempt_reported_running():
+    release = threading.Event()
+    attempts = []
+    
+    def hangs(engine=None):
+        attempts.append(1)
+        release.wait(5)
+    
+    result = run_steps([Step('hangs', hangs, timeout=0.2, retries=2, retry_delay=0)], ENGINE)['hangs']
+    assert result.status == 'timeout' and len(attempts) == 1
+    assert orchestrator.still_running('hangs')
+    release.set()
+    time.sleep(0.2)
+    assert not orchestrator.still_running('hangs')
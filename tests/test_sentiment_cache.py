@@ -0,0 +1,13 @@
+"""Sentiment cache keys"""
+
+from sentiment_cache import text_key
+
+def test_whitespace_differences_share_a_key():
+    assert text_key('Measles  cases\nrise ', 'textblob:1') == text_key('Measles cases rise', 'textblob:1')
+
+def test_case_is_part_of_the_key():
+    # TextBlob scores ':D' 1.0 and ':d' 0.0
+    assert text_key('Great news :D', 'textblob:1') != text_key('Great news :d', 'textblob:1')
+
+def test_keys_are_per_model():
+    assert text_key('Measles cases rise', 'textblob:1') != text_key('Measles cases rise', 'lexicon:abc')